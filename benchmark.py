@@ -0,0 +1,254 @@
+"""
+Reproducible benchmark suite for the generate -> train -> evaluate pipeline.
+
+Each (samples, features, classes) case runs in a fresh process so peak RSS is
+measured per case. Every stage is timed and appended as one JSON line to the
+output file, which can later be compared against a baseline run.
+
+Usage:
+    python benchmark.py --output bench.jsonl
+    python benchmark.py --sizes 500 5000 --features 3 --classes 3 --output new.jsonl --compare bench.jsonl
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import argparse
+import platform
+import resource
+import subprocess
+import multiprocessing
+
+import numpy as np
+
+
+DEFAULT_SIZES = [500, 5_000, 50_000, 1_000_000]
+DEFAULT_FEATURES = [3, 10]
+DEFAULT_CLASSES = [3, 10]
+
+# Standard (non-substituted) estimators that scale superlinearly are skipped above these
+# sizes unless --no-limits is given; see pipeline.LARGE_DATASET_ROWS for the substitution policy
+MODEL_ROW_LIMITS = {
+    "Support Vector Classification": 50_000,
+    "Multi-layer Perceptron": 200_000,
+}
+LEARNING_CURVE_ROW_LIMIT = 50_000
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def case_spec(n_samples, n_features, n_classes, seed):
+    """Builds a deterministic pipeline spec for one benchmark case."""
+    rng = np.random.default_rng(seed)
+    features = [f"feature_{i}" for i in range(n_features)]
+    classes = {
+        f"class_{i}": {
+            "mean": rng.uniform(50, 150, n_features).round(2).tolist(),
+            "std": rng.uniform(5.0, 15.0, n_features).round(1).tolist(),
+        }
+        for i in range(n_classes)
+    }
+    return {"features": features, "classes": classes, "total_sample_size": n_samples, "test_size": 0.2}
+
+
+def run_case(n_samples, n_features, n_classes, seed, apply_limits):
+    """Runs every stage for one case and returns a list of stage records."""
+    from sklearn.metrics import confusion_matrix
+    import pipeline
+    import splits
+    import rendering
+    import evaluation
+
+    spec = case_spec(n_samples, n_features, n_classes, seed)
+    features = spec["features"]
+    records = []
+
+    def stage(name, rows, func, *args, **kwargs):
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        wall = time.perf_counter() - start_time
+        records.append({
+            "stage": name,
+            "status": "ok",
+            "wall_s": round(wall, 6),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "rows_per_s": round(rows / wall, 1) if wall > 0 else None,
+        })
+        return result
+
+    def skipped(name, reason):
+        records.append({"stage": name, "status": "skipped", "reason": reason})
+
+    def prepare(class_data):
+        class_df = pipeline.build_dataframe(class_data, features)
+        split = splits.DatasetSplit(
+            class_df[features], class_df["Target"], test_size=spec["test_size"], random_state=seed
+        )
+        split.scale()
+        return class_df, split
+
+
+    mean_values_dict = {name: params["mean"] for name, params in spec["classes"].items()}
+    std_values_dict = {name: params["std"] for name, params in spec["classes"].items()}
+    class_data = stage(
+        "generate", n_samples, pipeline.generate_synthetic_data,
+        features, list(spec["classes"]), n_samples, mean_values_dict, std_values_dict, seed
+    )
+    class_df, split = stage("prepare", n_samples, prepare, class_data)
+    X_train, X_test, y_train, y_test = split.astuple()
+    del class_data
+
+    scaler, X_train_scaled, _ = split.scale()
+    fitted = {}
+    variants = pipeline.model_variants(len(X_train))
+    for model_name, model in pipeline.make_models(seed, len(X_train)).items():
+        limit = MODEL_ROW_LIMITS.get(model_name)
+        if apply_limits and limit and len(X_train) > limit and model_name not in variants:
+            skipped(f"train[{model_name}]", f"train rows > {limit}")
+            continue
+        # Substituted variants get their own stage names so they are never compared with the originals
+        label = f"{model_name} ({variants[model_name]})" if model_name in variants else model_name
+        if model_name in pipeline.SCALE_SENSITIVE_MODELS:
+            model = stage(f"train[{label}]", len(X_train), model.fit, X_train_scaled, y_train)
+            fitted[label] = pipeline.make_scaled_pipeline(scaler, model)
+        else:
+            fitted[label] = stage(f"train[{label}]", len(X_train), model.fit, X_train, y_train)
+
+    # The app's evaluation path: holdout, cross-validation and learning-curve fits in one grid
+    if apply_limits and len(X_train) > LEARNING_CURVE_ROW_LIMIT:
+        skipped("evaluate_grid", f"train rows > {LEARNING_CURVE_ROW_LIMIT}")
+    else:
+        table, _ = stage("evaluate_grid", len(X_train), evaluation.evaluate_grid, split, random_state=seed)
+        stage("holdout_results", len(X_test), evaluation.holdout_results, table, y_test)
+        stage("learning_curves", len(X_train), evaluation.learning_curves, table)
+
+    matrices = {
+        model_name: stage(
+            f"confusion_matrix[{model_name}]", len(X_test),
+            lambda: confusion_matrix(y_test, model.predict(X_test))
+        )
+        for model_name, model in fitted.items()
+    }
+    # All models share one figure, as in the app
+    stage("render_confusion_matrices", len(X_test), rendering.confusion_matrices_png, matrices, sorted(y_test.unique()))
+
+    stage("csv_export", n_samples, lambda: class_df.to_csv(index=False).encode("utf-8"))
+    return records
+
+
+def _case_worker(args, queue):
+    try:
+        queue.put(("ok", run_case(*args)))
+    except Exception as e:
+        queue.put(("error", repr(e)))
+
+
+def run_case_isolated(n_samples, n_features, n_classes, seed, apply_limits):
+    """Runs a case in a spawned process so its peak RSS is not shared with other cases."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(
+        target=_case_worker, args=((n_samples, n_features, n_classes, seed, apply_limits), queue)
+    )
+    process.start()
+    status, payload = queue.get()
+    process.join()
+    if status == "error":
+        return [{"stage": "case", "status": "error", "reason": payload}]
+    return payload
+
+
+def case_key(record):
+    return (record["n_samples"], record["n_features"], record["n_classes"], record["stage"])
+
+
+def load_records(path):
+    with open(path) as records_file:
+        return [json.loads(line) for line in records_file if line.strip()]
+
+
+def compare(records, baseline_records, threshold, min_time):
+    """
+    Flags stages that got slower than the baseline by more than threshold.
+
+    Stages faster than min_time seconds in the baseline are ignored as noise.
+    Returns a list of (key, baseline seconds, current seconds).
+    """
+    baseline = {case_key(record): record for record in baseline_records if record["status"] == "ok"}
+    regressions = []
+    for record in records:
+        previous = baseline.get(case_key(record))
+        if record["status"] != "ok" or previous is None or previous["wall_s"] < min_time:
+            continue
+        if record["wall_s"] > previous["wall_s"] * (1 + threshold):
+            regressions.append((case_key(record), previous["wall_s"], record["wall_s"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data generation, training and evaluation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--features", type=int, nargs="+", default=DEFAULT_FEATURES)
+    parser.add_argument("--classes", type=int, nargs="+", default=DEFAULT_CLASSES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.jsonl")
+    parser.add_argument("--no-limits", action="store_true", help="Run every estimator at every size.")
+    parser.add_argument("--compare", help="Baseline JSONL file to flag regressions against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%).")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Ignore baseline stages faster than this (s).")
+    args = parser.parse_args(argv)
+
+    run_info = {
+        "run_id": uuid.uuid4().hex[:12],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": git_revision(),
+        "host": socket.gethostname(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+    records = []
+    with open(args.output, "a") as output_file:
+        for n_samples in args.sizes:
+            for n_features in args.features:
+                for n_classes in args.classes:
+                    case = {"n_samples": n_samples, "n_features": n_features, "n_classes": n_classes}
+                    print(f"Case {case}")
+                    for record in run_case_isolated(n_samples, n_features, n_classes, args.seed, not args.no_limits):
+                        record = {**run_info, **case, **record}
+                        records.append(record)
+                        output_file.write(json.dumps(record) + "\n")
+                        if record["status"] == "ok":
+                            print(f"  {record['stage']:<50} {record['wall_s']:>10.4f} s {record['peak_rss_mb']:>9.1f} MB")
+                        else:
+                            print(f"  {record['stage']:<50} {record['status']}: {record.get('reason')}")
+                    output_file.flush()
+
+    if args.compare:
+        regressions = compare(records, load_records(args.compare), args.threshold, args.min_time)
+        for key, previous, current in regressions:
+            print(f"REGRESSION {key}: {previous:.4f} s -> {current:.4f} s")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
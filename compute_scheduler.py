@@ -0,0 +1,131 @@
+"""
+Process-wide CPU budget shared by every session and stage.
+
+Parallel work (learning curves, training) asks the scheduler for cores instead
+of using n_jobs=-1. Grants never exceed the budget in total, so concurrent
+sessions queue rather than oversubscribe the machine. BLAS/OpenMP pools are
+capped to a fixed number of threads per worker, both in this process and in
+the joblib workers a grant starts, so nested threading cannot multiply the
+core count.
+
+Usage:
+    with compute_scheduler.allocate(cores=4, label="learning_curve") as n_jobs:
+        learning_curve(..., n_jobs=n_jobs)
+"""
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from joblib import parallel_backend
+from threadpoolctl import threadpool_limits
+
+
+COMPUTE_CORES = int(os.environ.get("COMPUTE_CORES", os.cpu_count() or 1))
+# Threads each worker may use inside BLAS/OpenMP
+THREADS_PER_WORKER = int(os.environ.get("THREADS_PER_WORKER", 1))
+# Cores background jobs leave free for interactive work such as generation and streaming
+INTERACTIVE_RESERVED_CORES = int(os.environ.get("INTERACTIVE_RESERVED_CORES", 1))
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class ComputeScheduler:
+    """Hands out cores from a fixed budget in FIFO order."""
+
+    def __init__(self, total_cores=COMPUTE_CORES, threads_per_worker=THREADS_PER_WORKER):
+        self.total_cores = max(1, total_cores)
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.in_use = 0
+        self.running = {}
+        self.waiting = deque()
+        self.started = 0
+        self.completed = 0
+        self.total_wait_s = 0.0
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._held = threading.local()
+
+    @contextmanager
+    def allocate(self, cores=None, label="task"):
+        """
+        Blocks until cores are free, then yields the number granted.
+
+        A grant is at most `cores` (the whole budget if None) and at least one;
+        requests are served in arrival order, so a large request cannot be
+        starved by a stream of small ones. Nested requests reuse the caller's
+        grant instead of queueing behind it.
+        """
+        requested = self.total_cores if cores is None or cores < 1 else min(cores, self.total_cores)
+        held = getattr(self._held, "cores", 0)
+        if held:
+            # Nested request from a thread that already holds cores: run within that grant
+            yield min(requested, held)
+            return
+
+        queued_at = time.perf_counter()
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self.waiting.append(ticket)
+            while self.waiting[0] != ticket or self.in_use >= self.total_cores:
+                self._condition.wait()
+            self.waiting.popleft()
+            granted = min(requested, self.total_cores - self.in_use)
+            self.in_use += granted
+            self.running[ticket] = (label, granted)
+            self.started += 1
+            self.total_wait_s += time.perf_counter() - queued_at
+            # Let the next request in line take any cores still free
+            self._condition.notify_all()
+
+        self._held.cores = granted
+        try:
+            with parallel_backend("loky", n_jobs=granted, inner_max_num_threads=self.threads_per_worker):
+                yield granted
+        finally:
+            self._held.cores = 0
+            with self._condition:
+                self.in_use -= granted
+                del self.running[ticket]
+                self.completed += 1
+                self._condition.notify_all()
+
+    def stats(self):
+        """Returns a snapshot of the budget, queue depth and utilization."""
+        with self._condition:
+            return {
+                "total_cores": self.total_cores,
+                "in_use": self.in_use,
+                "utilization": self.in_use / self.total_cores,
+                "queue_depth": len(self.waiting),
+                "running": list(self.running.values()),
+                "completed": self.completed,
+                "mean_wait_s": self.total_wait_s / self.started if self.started else 0.0,
+            }
+
+
+def get_scheduler():
+    """Returns the process-wide scheduler, capping BLAS/OpenMP threads on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ComputeScheduler()
+            threadpool_limits(limits=_scheduler.threads_per_worker)
+        return _scheduler
+
+
+def allocate(cores=None, label="task"):
+    """Allocates cores from the process-wide scheduler; see ComputeScheduler.allocate."""
+    return get_scheduler().allocate(cores, label)
+
+
+def background_cores():
+    """Returns the most cores a background job should hold at once (at least one)."""
+    return max(1, get_scheduler().total_cores - INTERACTIVE_RESERVED_CORES)
+
+
+def stats():
+    return get_scheduler().stats()
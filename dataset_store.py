@@ -0,0 +1,133 @@
+"""
+Versioned on-disk store for generated and uploaded datasets.
+
+Each dataset is saved once under DATASET_STORE_DIR/<dataset id>/:
+- features.npy: float64 feature matrix
+- labels.npy: fixed-width string labels
+- spec.json: feature names, classes, shape, source and the generation spec
+
+The dataset ID is a content hash of the features, labels and feature names, so
+saving the same data twice is a no-op and an ID always refers to exactly the
+same rows. Datasets are reopened with np.load(mmap_mode="r"): every session and
+process maps the same read-only pages instead of holding its own copy.
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import pipeline
+
+
+DATASET_STORE_DIR = os.environ.get("DATASET_STORE_DIR", "dataset_store")
+DATASET_ID_LENGTH = 16
+FEATURES_FILE = "features.npy"
+LABELS_FILE = "labels.npy"
+SPEC_FILE = "spec.json"
+
+
+def dataset_path(dataset_id, store_dir=None):
+    return os.path.join(store_dir or DATASET_STORE_DIR, dataset_id)
+
+
+def save_dataset(X, y, spec=None, source="generated", store_dir=None):
+    """
+    Saves a feature matrix and labels unless an identical dataset is stored; returns the dataset ID.
+
+    Args:
+        X: DataFrame (its columns become the feature names) or 2-D array.
+        y: Labels; stored as strings.
+        spec: Optional JSON-serializable description of how the data was made.
+    """
+    features = list(X.columns) if hasattr(X, "columns") else [f"Feature_{i}" for i in range(np.shape(X)[1])]
+    X_values = np.ascontiguousarray(np.asarray(X, dtype=np.float64))
+    y_values = np.asarray(y).astype(str)
+    dataset_id = pipeline.dataset_fingerprint(pd.DataFrame(X_values, columns=features), y_values)[:DATASET_ID_LENGTH]
+
+    path = dataset_path(dataset_id, store_dir)
+    if os.path.exists(os.path.join(path, SPEC_FILE)):
+        return dataset_id
+
+    # Write into a private directory and rename it into place, so readers never see a partial dataset
+    os.makedirs(store_dir or DATASET_STORE_DIR, exist_ok=True)
+    staging = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    os.makedirs(staging)
+    try:
+        np.save(os.path.join(staging, FEATURES_FILE), X_values)
+        np.save(os.path.join(staging, LABELS_FILE), y_values)
+        with open(os.path.join(staging, SPEC_FILE), "w") as spec_file:
+            json.dump({
+                "dataset_id": dataset_id,
+                "source": source,
+                "features": features,
+                "classes": sorted(np.unique(y_values).tolist()),
+                "n_rows": int(X_values.shape[0]),
+                "n_features": int(X_values.shape[1]),
+                "created_at": time.time(),
+                "spec": spec or {},
+            }, spec_file, indent=2, default=str)
+        os.rename(staging, path)
+    except OSError:
+        # Another session stored the same dataset first
+        if not os.path.exists(os.path.join(path, SPEC_FILE)):
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return dataset_id
+
+
+def save_frame(class_df, features, spec=None, source="generated", store_dir=None):
+    """Saves a DataFrame with a Target column; returns the dataset ID."""
+    return save_dataset(class_df[features], class_df["Target"], spec, source, store_dir)
+
+
+@lru_cache(maxsize=32)
+def _open(path, mmap_mode):
+    with open(os.path.join(path, SPEC_FILE)) as spec_file:
+        meta = json.load(spec_file)
+    X = np.load(os.path.join(path, FEATURES_FILE), mmap_mode=mmap_mode)
+    y = np.load(os.path.join(path, LABELS_FILE), mmap_mode=mmap_mode)
+    return X, y, meta
+
+
+def load_dataset(dataset_id, mmap_mode="r", store_dir=None):
+    """
+    Returns (X, y, metadata) for a stored dataset.
+
+    With the default mmap_mode the arrays are read-only memory maps shared by
+    every caller in the process; pass mmap_mode=None to load private copies.
+    """
+    path = dataset_path(dataset_id, store_dir)
+    if not os.path.exists(os.path.join(path, SPEC_FILE)):
+        raise KeyError(f"No stored dataset {dataset_id!r}")
+    return _open(os.path.abspath(path), mmap_mode)
+
+
+def load_frame(dataset_id, mmap_mode="r", store_dir=None):
+    """Returns (DataFrame with a Target column, metadata) for a stored dataset."""
+    X, y, meta = load_dataset(dataset_id, mmap_mode, store_dir)
+    class_df = pd.DataFrame(X, columns=meta["features"], copy=False)
+    class_df["Target"] = y
+    return class_df, meta
+
+
+def list_datasets(source=None, store_dir=None):
+    """Returns metadata for every stored dataset, newest first, optionally filtered by source."""
+    store_dir = store_dir or DATASET_STORE_DIR
+    if not os.path.isdir(store_dir):
+        return []
+    datasets = []
+    for name in os.listdir(store_dir):
+        spec_path = os.path.join(store_dir, name, SPEC_FILE)
+        if name.endswith(".tmp") or not os.path.exists(spec_path):
+            continue
+        with open(spec_path) as spec_file:
+            meta = json.load(spec_file)
+        if source is None or meta["source"] == source:
+            datasets.append(meta)
+    return sorted(datasets, key=lambda meta: meta["created_at"], reverse=True)
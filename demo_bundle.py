@@ -0,0 +1,143 @@
+"""
+Precomputed results for the Algorithm Education demo.
+
+The demo covers a fixed matrix of algorithms x bundled datasets, so every
+combination is trained once by a build step and stored in a compact joblib
+bundle that the page loads at startup.
+
+Usage:
+    python demo_bundle.py [output path]
+"""
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.datasets import load_iris, load_wine, load_digits
+from sklearn.model_selection import train_test_split, learning_curve
+from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier, ExtraTreesClassifier
+from sklearn.naive_bayes import GaussianNB, MultinomialNB
+from sklearn.svm import SVC
+from sklearn.neural_network import MLPClassifier
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+import compute_scheduler
+
+
+BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo_bundle.joblib")
+BUNDLE_VERSION = 1
+TEST_SIZE = 0.3
+RANDOM_STATE = 42
+LEARNING_CURVE_SIZES = np.linspace(0.1, 1.0, 5)
+
+# Dataset loaders and estimator classes for the interactive demo
+DEMO_DATASETS = {
+    "Iris Dataset": load_iris,
+    "Wine Dataset": load_wine,
+    "Digits Dataset": load_digits,
+}
+
+DEMO_MODELS = {
+    "Gaussian Naive Bayes": GaussianNB,
+    "Multinomial Naive Bayes": MultinomialNB,
+    "AdaBoost Classifier": AdaBoostClassifier,
+    "Random Forest Classifier": RandomForestClassifier,
+    "Support Vector Classification": SVC,
+    "Multi-layer Perceptron": MLPClassifier,
+    "Extra Trees Classifier": ExtraTreesClassifier,
+}
+
+
+def load_demo_dataset(dataset_option):
+    """Loads a bundled dataset with the target column renamed to Label."""
+    data = DEMO_DATASETS[dataset_option](as_frame=True).frame
+    return data.rename(columns={"target": "Label"})
+
+
+def make_demo_model(algorithm):
+    """Instantiates only the selected estimator, seeded when it accepts a seed."""
+    model = DEMO_MODELS[algorithm]()
+    if "random_state" in model.get_params():
+        model.set_params(random_state=RANDOM_STATE)
+    return model
+
+
+def compute_demo_result(algorithm, dataset_option, n_jobs=None):
+    """
+    Trains one (algorithm, dataset) combination.
+
+    n_jobs is a request to the shared compute budget (None for as many cores
+    as are free). Returns a dict with accuracy, classification report,
+    confusion matrix, class labels and learning-curve arrays.
+    """
+    data = load_demo_dataset(dataset_option)
+    X = data.drop(columns=["Label"])
+    y = data["Label"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+    with compute_scheduler.allocate(n_jobs, label=f"demo[{algorithm}]") as granted:
+        model = make_demo_model(algorithm)
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+
+        train_sizes, train_scores, test_scores = learning_curve(
+            make_demo_model(algorithm), X, y, cv=5, scoring='accuracy',
+            train_sizes=LEARNING_CURVE_SIZES, n_jobs=granted
+        )
+    return {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "report": classification_report(y_test, y_pred, output_dict=True),
+        "confusion_matrix": confusion_matrix(y_test, y_pred).astype(np.int32),
+        "classes": model.classes_,
+        "train_sizes": train_sizes,
+        "train_mean": train_scores.mean(axis=1),
+        "test_mean": test_scores.mean(axis=1),
+    }
+
+
+def bundle_signature():
+    """Describes the demo configuration; a bundle built for another one is stale."""
+    return {
+        "version": BUNDLE_VERSION,
+        "algorithms": list(DEMO_MODELS),
+        "datasets": list(DEMO_DATASETS),
+        "test_size": TEST_SIZE,
+        "random_state": RANDOM_STATE,
+        "train_sizes": LEARNING_CURVE_SIZES.tolist(),
+    }
+
+
+def build_bundle(path=BUNDLE_PATH, n_jobs=None):
+    """Trains every combination and writes the compressed results bundle."""
+    results = {}
+    for dataset_option in DEMO_DATASETS:
+        for algorithm in DEMO_MODELS:
+            start_time = time.time()
+            results[(algorithm, dataset_option)] = compute_demo_result(algorithm, dataset_option, n_jobs)
+            print(f"{algorithm} / {dataset_option}: {time.time() - start_time:.2f} s")
+
+    meta = bundle_signature()
+    meta["sklearn_version"] = sklearn.__version__
+    joblib.dump({"meta": meta, "results": results}, path, compress=3)
+    return path
+
+
+def load_bundle(path=BUNDLE_PATH):
+    """Returns the bundled results, or None if the bundle is missing, unreadable or stale."""
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = joblib.load(path)
+    except Exception:
+        return None
+
+    meta = {key: value for key, value in bundle.get("meta", {}).items() if key != "sklearn_version"}
+    if meta != bundle_signature():
+        return None
+    return bundle["results"]
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_bundle(*sys.argv[1:2])}")
@@ -0,0 +1,184 @@
+"""
+Registry of feature distributions for synthetic data.
+
+Each distribution samples a whole group of features at once: every feature of
+a class that uses the same distribution is drawn in a single vectorized call.
+Per-feature parameters are stacked into arrays, one entry per feature, so there
+are no Python loops over rows or features. List parameters (mixture components,
+categories) are padded with zero-weight entries to a common length.
+
+A feature spec is a dict with a "type" key naming a registered distribution,
+plus that distribution's parameters:
+
+    {"type": "uniform", "low": 0, "high": 10}
+    {"type": "lognormal", "mean": 0, "sigma": 0.5}
+    {"type": "mixture", "means": [0, 5], "stds": [1, 1], "weights": [0.3, 0.7]}
+    {"type": "categorical", "values": [1, 2, 3], "probs": [0.2, 0.5, 0.3]}
+
+Normal features are described by the class's mean and std (and correlation),
+so "normal" specs are only needed to set them explicitly.
+"""
+import numpy as np
+
+
+NORMAL = "normal"
+
+DISTRIBUTIONS = {}
+
+
+class Distribution:
+    """
+    A named sampler with default parameters.
+
+    sampler(rng, n_rows, params) receives params as {name: array} with one row
+    per feature in the group and returns an (n_rows, n_features) array.
+    minimums gives the smallest valid value of a parameter (every entry of a
+    list parameter); check(params) may raise ValueError for rules spanning
+    several parameters.
+    """
+
+    def __init__(self, name, label, defaults, sampler, list_params=(), weight_param=None, minimums=None, check=None):
+        self.name = name
+        self.label = label
+        self.defaults = defaults
+        self.sampler = sampler
+        self.list_params = tuple(list_params)
+        self.weight_param = weight_param
+        self.minimums = minimums or {}
+        self.check = check
+
+    def validate(self, spec):
+        """Returns the spec's parameters merged with defaults; raises ValueError if they are invalid."""
+        params = {**self.defaults, **{key: value for key, value in spec.items() if key != "type"}}
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"Unknown {self.name} parameters: {', '.join(sorted(unknown))}")
+        for key, value in params.items():
+            if key in self.list_params:
+                if not isinstance(value, (list, tuple)) or not all(_is_finite_number(item) for item in value):
+                    raise ValueError(f"{self.label} {key} must be a list of finite numbers.")
+                values = value
+            elif not _is_finite_number(value):
+                raise ValueError(f"{self.label} {key} must be a finite number.")
+            else:
+                values = [value]
+            if key in self.minimums and min(values, default=self.minimums[key]) < self.minimums[key]:
+                raise ValueError(f"{self.label} {key} must be at least {self.minimums[key]:g}.")
+        if self.list_params:
+            lengths = {len(params[key]) for key in self.list_params}
+            if len(lengths) != 1 or 0 in lengths:
+                raise ValueError(f"{self.label} needs non-empty {', '.join(self.list_params)} of equal length.")
+        if self.weight_param:
+            weights = np.asarray(params[self.weight_param], dtype=np.float64)
+            if (weights < 0).any() or weights.sum() <= 0:
+                raise ValueError(f"{self.label} {self.weight_param} must be non-negative and not all zero.")
+        if self.check:
+            self.check(params)
+        return params
+
+    def stack(self, specs):
+        """Stacks validated per-feature parameters into arrays with one row per feature."""
+        params = [self.validate(spec) for spec in specs]
+        stacked = {}
+        width = max((len(param[self.list_params[0]]) for param in params), default=0) if self.list_params else 0
+        for key in self.defaults:
+            if key in self.list_params:
+                # Padding entries get zero weight, so they are never drawn
+                stacked[key] = np.zeros((len(params), width))
+                for row, param in enumerate(params):
+                    stacked[key][row, :len(param[key])] = param[key]
+            else:
+                stacked[key] = np.asarray([param[key] for param in params], dtype=np.float64)
+        if self.weight_param:
+            weights = stacked[self.weight_param]
+            stacked[self.weight_param] = weights / weights.sum(axis=1, keepdims=True)
+        return stacked
+
+    def sample(self, rng, n_rows, specs):
+        """Draws n_rows for every feature spec in one call; returns an (n_rows, len(specs)) array."""
+        return self.sampler(rng, n_rows, self.stack(specs))
+
+
+def _is_finite_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool) and np.isfinite(value)
+
+
+def _check_uniform(params):
+    if params["low"] > params["high"]:
+        raise ValueError("Uniform low must not exceed high.")
+
+
+def register(distribution):
+    DISTRIBUTIONS[distribution.name] = distribution
+    return distribution
+
+
+def get(name):
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {name!r}; choose from {', '.join(DISTRIBUTIONS)}")
+    return DISTRIBUTIONS[name]
+
+
+def validate(spec):
+    """Validates one feature spec; raises ValueError if it is invalid."""
+    return get(spec.get("type", NORMAL)).validate(spec)
+
+
+def _choose(rng, n_rows, weights):
+    """Picks a column index per row and feature from each feature's weights, vectorized."""
+    cumulative = np.cumsum(weights, axis=1)
+    draws = rng.random((n_rows, weights.shape[0]))
+    # Count how many cumulative weights each draw exceeds
+    choices = (draws[:, :, None] >= cumulative[None, :, :]).sum(axis=2)
+    return np.minimum(choices, weights.shape[1] - 1)
+
+
+def _take_per_feature(table, choices):
+    return table[np.arange(table.shape[0])[None, :], choices]
+
+
+def _sample_normal(rng, n_rows, params):
+    return rng.standard_normal((n_rows, len(params["mean"]))) * params["std"] + params["mean"]
+
+
+def _sample_uniform(rng, n_rows, params):
+    return rng.uniform(params["low"], params["high"], (n_rows, len(params["low"])))
+
+
+def _sample_lognormal(rng, n_rows, params):
+    return rng.lognormal(params["mean"], params["sigma"], (n_rows, len(params["mean"])))
+
+
+def _sample_mixture(rng, n_rows, params):
+    components = _choose(rng, n_rows, params["weights"])
+    noise = rng.standard_normal(components.shape)
+    return _take_per_feature(params["means"], components) + noise * _take_per_feature(params["stds"], components)
+
+
+def _sample_categorical(rng, n_rows, params):
+    return _take_per_feature(params["values"], _choose(rng, n_rows, params["probs"]))
+
+
+register(Distribution(NORMAL, "Normal", {"mean": 0.0, "std": 1.0}, _sample_normal, minimums={"std": 0.0}))
+register(Distribution("uniform", "Uniform", {"low": 0.0, "high": 1.0}, _sample_uniform, check=_check_uniform))
+register(Distribution(
+    "lognormal", "Log-normal", {"mean": 0.0, "sigma": 0.5}, _sample_lognormal, minimums={"sigma": 0.0}
+))
+register(Distribution(
+    "mixture", "Gaussian mixture", {"means": [0.0, 5.0], "stds": [1.0, 1.0], "weights": [0.5, 0.5]},
+    _sample_mixture, list_params=("means", "stds", "weights"), weight_param="weights", minimums={"stds": 0.0}
+))
+register(Distribution(
+    "categorical", "Categorical", {"values": [0.0, 1.0, 2.0], "probs": [0.5, 0.3, 0.2]},
+    _sample_categorical, list_params=("values", "probs"), weight_param="probs"
+))
+
+
+def group_features(feature_specs):
+    """Returns {distribution name: [(feature index, spec), ...]} in a fixed order, skipping normal features."""
+    groups = {}
+    for index, spec in sorted(feature_specs.items()):
+        name = spec.get("type", NORMAL)
+        if name != NORMAL:
+            groups.setdefault(name, []).append((index, spec))
+    return dict(sorted(groups.items()))
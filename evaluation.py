@@ -0,0 +1,240 @@
+"""
+One evaluation engine for holdout scores, learning curves and confusion matrices.
+
+evaluate_grid() plans every fit the views need as an independent task:
+- one holdout fit per candidate on the full training split
+- one fit per candidate x cross-validation fold x learning-curve train size
+
+Tasks are deduplicated (small folds can round several train sizes to the same
+row count) and run on a single joblib pool sized by the shared compute budget.
+The full-size fold fits double as the cross-validation scores, so no extra
+CV pass is needed.
+
+The result is one tidy table with a row per fit. The helpers below derive every
+view from it: the results dict used by the comparison tables, learning curves,
+cross-validation scores and confusion matrices.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+
+import pipeline
+import compute_scheduler
+
+
+HOLDOUT = "holdout"
+TASKS_PER_WORKER_BATCH = 4
+TABLE_COLUMNS = [
+    "Model", "Variant", "Fold", "Train Size", "Fit Time (s)",
+    "Train Accuracy", "Test Accuracy", "Status", "Error", "Predictions",
+]
+
+
+def plan_tasks(model_names, split, train_sizes=pipeline.LEARNING_CURVE_SIZES):
+    """Returns the unique (model name, fold, train row count) fits; fold is HOLDOUT or a fold number."""
+    tasks = []
+    for model_name in model_names:
+        tasks.append((model_name, HOLDOUT, split.n_train))
+        for fold, (fold_train, _) in enumerate(split.folds):
+            counts = np.unique(np.maximum(1, (np.asarray(train_sizes) * len(fold_train)).astype(int)))
+            tasks.extend((model_name, fold, int(n_rows)) for n_rows in counts)
+    return list(dict.fromkeys(tasks))
+
+
+def _run_task(estimator, X_fit, y_fit, fit_index, X_eval, y_eval, eval_index, keep_model):
+    """
+    Fits one task and scores it; errors are returned instead of raised so one failure cannot sink the grid.
+
+    Predictions and the fitted model are kept only when keep_model is set (the holdout fits).
+    """
+    if fit_index is not None:
+        X_fit, y_fit = X_fit[fit_index], y_fit[fit_index]
+    if eval_index is not None:
+        X_eval, y_eval = X_eval[eval_index], y_eval[eval_index]
+    try:
+        start_time = time.perf_counter()
+        estimator.fit(X_fit, y_fit)
+        fit_time = time.perf_counter() - start_time
+        y_pred = estimator.predict(X_eval)
+        return {
+            "Fit Time (s)": round(fit_time, 4),
+            "Train Accuracy": accuracy_score(y_fit, estimator.predict(X_fit)),
+            "Test Accuracy": accuracy_score(y_eval, y_pred),
+            "Status": "Success",
+            "Error": None,
+            "Predictions": y_pred if keep_model else None,
+            "model": estimator if keep_model else None,
+        }
+    except Exception as e:
+        return {"Status": "Failed", "Error": str(e), "model": None}
+
+
+def evaluate_grid(split, random_state=None, train_sizes=pipeline.LEARNING_CURVE_SIZES,
+                  large_threshold=pipeline.LARGE_DATASET_ROWS, on_error=None, progress=None, n_workers=None):
+    """
+    Runs the full candidate x fold x train-size grid for a DatasetSplit.
+
+    Scale-sensitive candidates are trained on the split's cached scaled arrays
+    for the holdout fit and behind a fold-local scaler for the CV fits, so
+    validation folds never leak into scaling.
+
+    Args:
+        on_error: Optional callback receiving (model_name, message) for
+            candidates whose holdout fit failed.
+        progress: Optional callback receiving (completed tasks, total tasks)
+            after each batch; it may raise to abandon the grid early.
+        n_workers: Most cores to request per batch; None uses the whole
+            compute budget. Background jobs in the app pass
+            compute_scheduler.background_cores().
+
+    Returns (table, models): the tidy results table and the holdout-fitted
+    models, which accept raw features.
+    """
+    candidates = pipeline.make_models(random_state, split.n_train, large_threshold)
+    variants = pipeline.model_variants(split.n_train, large_threshold)
+    scaler, X_train_scaled, X_test_scaled = split.scale()
+    X_train_values = np.asarray(split.X_train, dtype=np.float64)
+    y_train_values = np.asarray(split.y_train)
+    y_test_values = np.asarray(split.y_test)
+
+    tasks = plan_tasks(candidates, split, train_sizes)
+    jobs = []
+    for model_name, fold, n_rows in tasks:
+        sensitive = model_name in pipeline.SCALE_SENSITIVE_MODELS
+        if fold == HOLDOUT:
+            X_fit, X_eval = (X_train_scaled, X_test_scaled) if sensitive else (split.X_train, split.X_test)
+            jobs.append(delayed(_run_task)(
+                clone(candidates[model_name]), X_fit, y_train_values, None, X_eval, y_test_values, None, True
+            ))
+        else:
+            fold_train, fold_validation = split.folds[fold]
+            estimator = clone(candidates[model_name])
+            if sensitive:
+                estimator = pipeline.make_scaled_pipeline(StandardScaler(), estimator)
+            jobs.append(delayed(_run_task)(
+                estimator, X_train_values, y_train_values, fold_train[:n_rows],
+                X_train_values, y_train_values, fold_validation, False
+            ))
+
+    outcomes = []
+    # Batches keep the pool busy while giving progress callbacks a chance to run. Cores are
+    # requested per batch, so work queued behind the grid waits for one batch at most.
+    n_workers = n_workers or compute_scheduler.get_scheduler().total_cores
+    batch_size = n_workers * TASKS_PER_WORKER_BATCH
+    for start in range(0, len(jobs), batch_size):
+        with compute_scheduler.allocate(n_workers, label="evaluation_grid") as n_jobs:
+            outcomes.extend(Parallel(n_jobs=n_jobs)(jobs[start:start + batch_size]))
+        if progress:
+            progress(len(outcomes), len(jobs))
+
+    rows = []
+    models = {}
+    for (model_name, fold, n_rows), outcome in zip(tasks, outcomes):
+        model = outcome.pop("model")
+        if fold == HOLDOUT:
+            if model is not None and model_name in pipeline.SCALE_SENSITIVE_MODELS:
+                model = pipeline.make_scaled_pipeline(scaler, model)
+            models[model_name] = model if model is not None else clone(candidates[model_name])
+            if outcome["Status"] != "Success" and on_error:
+                on_error(model_name, outcome["Error"])
+        rows.append({
+            "Model": model_name,
+            "Variant": variants.get(model_name, "Standard"),
+            "Fold": fold,
+            "Train Size": n_rows,
+            **outcome,
+        })
+    return pd.DataFrame(rows, columns=TABLE_COLUMNS), models
+
+
+def holdout_results(table, y_test):
+    """
+    Returns the per-model results dict shown in the comparison tables.
+
+    Each entry has Accuracy, Precision, Recall, F1-Score, Training Time (s),
+    Status and Variant, plus the mean accuracy of the full-size fold fits as
+    "CV Accuracy".
+    """
+    cv = cv_scores(table)
+    results = {}
+    for _, row in table[table["Fold"] == HOLDOUT].iterrows():
+        if row["Status"] == "Success":
+            y_pred = row["Predictions"]
+            results[row["Model"]] = {
+                "Accuracy": accuracy_score(y_test, y_pred),
+                "Precision": precision_score(y_test, y_pred, average='weighted'),
+                "Recall": recall_score(y_test, y_pred, average='weighted'),
+                "F1-Score": f1_score(y_test, y_pred, average='weighted'),
+                "CV Accuracy": cv.get(row["Model"], (None, None))[0],
+                "Training Time (s)": row["Fit Time (s)"],
+                "Status": "Success",
+                "Variant": row["Variant"],
+            }
+        else:
+            results[row["Model"]] = {
+                "Accuracy": None,
+                "Precision": None,
+                "Recall": None,
+                "F1-Score": None,
+                "CV Accuracy": None,
+                "Training Time (s)": None,
+                "Status": "Failed",
+                "Variant": row["Variant"],
+            }
+    return results
+
+
+def best_model_name(results):
+    """Returns the model with the highest holdout accuracy, or None."""
+    scored = {name: result["Accuracy"] for name, result in results.items() if result["Accuracy"] is not None}
+    return max(scored, key=scored.get) if scored else None
+
+
+def _fold_rows(table):
+    folds = table[(table["Fold"] != HOLDOUT) & (table["Status"] == "Success")].copy()
+    folds["Train Accuracy"] = folds["Train Accuracy"].astype(float)
+    folds["Test Accuracy"] = folds["Test Accuracy"].astype(float)
+    return folds
+
+
+def cv_scores(table):
+    """Returns {model name: (mean, std)} accuracy of each fold's full-size fit."""
+    folds = _fold_rows(table)
+    largest = folds.groupby(["Model", "Fold"])["Train Size"].transform("max")
+    full = folds[folds["Train Size"] == largest].groupby("Model")["Test Accuracy"]
+    return {model_name: (scores.mean(), scores.std(ddof=0)) for model_name, scores in full}
+
+
+def learning_curves(table):
+    """Returns {model name: learning-curve dict} with train_sizes and mean/std train and validation accuracy."""
+    curves = {}
+    for model_name, rows in _fold_rows(table).groupby("Model"):
+        by_size = rows.groupby("Train Size")
+        curves[model_name] = {
+            "train_sizes": np.asarray(list(by_size.groups)),
+            "train_scores_mean": by_size["Train Accuracy"].mean().to_numpy(),
+            "train_scores_std": by_size["Train Accuracy"].std(ddof=0).to_numpy(),
+            "test_scores_mean": by_size["Test Accuracy"].mean().to_numpy(),
+            "test_scores_std": by_size["Test Accuracy"].std(ddof=0).to_numpy(),
+        }
+    return curves
+
+
+def confusion_matrices(table, y_test, labels):
+    """Returns {model name: confusion matrix} for every successful holdout fit."""
+    holdout = table[(table["Fold"] == HOLDOUT) & (table["Status"] == "Success")]
+    return {
+        row["Model"]: confusion_matrix(y_test, row["Predictions"], labels=labels)
+        for _, row in holdout.iterrows()
+    }
+
+
+def holdout_predictions(table, model_name):
+    """Returns a model's holdout predictions, or None if its fit failed."""
+    rows = table[(table["Fold"] == HOLDOUT) & (table["Model"] == model_name) & (table["Status"] == "Success")]
+    return rows["Predictions"].iloc[0] if len(rows) else None
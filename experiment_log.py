@@ -0,0 +1,210 @@
+"""
+Append-only experiment log in a local SQLite database.
+
+Every training run records its dataset spec, fingerprint, timings and host info
+in `runs`. Each candidate's metrics and model size go into `model_results`.
+Rows are only ever inserted. Both tables are indexed on the columns the
+comparison page filters by (time, source, fingerprint, model, accuracy), so
+thousands of runs can be queried quickly.
+"""
+import os
+import json
+import time
+import uuid
+import sqlite3
+import socket
+import platform
+import subprocess
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+import session_memory
+
+
+EXPERIMENT_LOG_PATH = os.environ.get("EXPERIMENT_LOG_PATH", "experiment_log.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    fingerprint TEXT,
+    seed INTEGER,
+    n_rows INTEGER,
+    n_features INTEGER,
+    n_classes INTEGER,
+    spec_json TEXT,
+    timings_json TEXT,
+    host TEXT,
+    python TEXT,
+    sklearn TEXT,
+    git_rev TEXT
+);
+CREATE TABLE IF NOT EXISTS model_results (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    model TEXT NOT NULL,
+    variant TEXT,
+    status TEXT,
+    accuracy REAL,
+    precision REAL,
+    recall REAL,
+    f1 REAL,
+    cv_accuracy REAL,
+    training_time_s REAL,
+    model_bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_recorded_at ON runs(recorded_at);
+CREATE INDEX IF NOT EXISTS runs_source_recorded_at ON runs(source, recorded_at);
+CREATE INDEX IF NOT EXISTS runs_fingerprint ON runs(fingerprint);
+CREATE INDEX IF NOT EXISTS model_results_run_id ON model_results(run_id);
+CREATE INDEX IF NOT EXISTS model_results_model_accuracy ON model_results(model, accuracy);
+"""
+
+_host_info = None
+
+
+def connect(path=None):
+    """Opens the log, creating the schema on first use."""
+    connection = sqlite3.connect(path or EXPERIMENT_LOG_PATH, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def host_info():
+    """Returns host, Python, scikit-learn and git revision details (computed once)."""
+    global _host_info
+    if _host_info is None:
+        try:
+            git_rev = subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL, text=True
+            ).strip()
+        except Exception:
+            git_rev = None
+        _host_info = {
+            "host": socket.gethostname(),
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "git_rev": git_rev,
+        }
+    return _host_info
+
+
+def record_run(results, spec, source="app", fingerprint=None, seed=None, n_rows=None, n_features=None,
+               n_classes=None, timings=None, model_sizes=None, path=None):
+    """
+    Appends one run and its per-model results; returns the new run ID.
+
+    Args:
+        results: {model name: metrics dict} as returned by
+            evaluation.holdout_results.
+        spec: JSON-serializable description of the dataset and settings.
+        model_sizes: Optional {model name: bytes}.
+    """
+    run_id = uuid.uuid4().hex[:12]
+    info = host_info()
+    model_sizes = model_sizes or {}
+    with connect(path) as connection:
+        connection.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_id, time.time(), source, fingerprint, seed, n_rows, n_features, n_classes,
+                json.dumps(spec, default=str), json.dumps(timings or {}, default=str),
+                info["host"], info["python"], info["sklearn"], info["git_rev"],
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO model_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id, model_name, result.get("Variant"), result.get("Status"),
+                    result.get("Accuracy"), result.get("Precision"), result.get("Recall"),
+                    result.get("F1-Score"), result.get("CV Accuracy"), result.get("Training Time (s)"),
+                    model_sizes.get(model_name),
+                )
+                for model_name, result in results.items()
+            ],
+        )
+    connection.close()
+    return run_id
+
+
+def record_evaluation(split, results, models, spec, source="app", seed=None, timings=None, path=None):
+    """Records a finished evaluation of a DatasetSplit, deriving the dataset fields from the split."""
+    # Imported here because pipeline also records its runs through this module
+    import pipeline
+
+    return record_run(
+        results, spec, source=source,
+        fingerprint=pipeline.dataset_fingerprint(split.X, split.y),
+        seed=seed,
+        n_rows=len(split.y),
+        n_features=split.X.shape[1],
+        n_classes=len(np.unique(np.asarray(split.y))),
+        timings=timings,
+        model_sizes={name: session_memory.estimate_size(model) for name, model in models.items()},
+        path=path,
+    )
+
+
+def query_results(path=None, models=None, sources=None, since=None, min_accuracy=None, limit=5000):
+    """
+    Returns model results joined with their run, newest first, as a DataFrame.
+
+    Filters are applied in SQL so they use the indexes; limit caps the rows loaded.
+    """
+    clauses, params = [], []
+    if models:
+        clauses.append(f"m.model IN ({', '.join('?' * len(models))})")
+        params.extend(models)
+    if sources:
+        clauses.append(f"r.source IN ({', '.join('?' * len(sources))})")
+        params.extend(sources)
+    if since is not None:
+        clauses.append("r.recorded_at >= ?")
+        params.append(since)
+    if min_accuracy is not None:
+        clauses.append("m.accuracy >= ?")
+        params.append(min_accuracy)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    query = f"""
+        SELECT r.run_id, r.recorded_at, r.source, r.fingerprint, r.seed, r.n_rows, r.n_features,
+               r.n_classes, r.host, r.git_rev, m.model, m.variant, m.status, m.accuracy, m.precision,
+               m.recall, m.f1, m.cv_accuracy, m.training_time_s, m.model_bytes
+        FROM runs r JOIN model_results m ON m.run_id = r.run_id
+        {where}
+        ORDER BY r.recorded_at DESC
+        LIMIT ?
+    """
+    with connect(path) as connection:
+        frame = pd.read_sql_query(query, connection, params=params + [limit])
+    connection.close()
+    frame["recorded_at"] = pd.to_datetime(frame["recorded_at"], unit="s")
+    return frame
+
+
+def get_run(run_id, path=None):
+    """Returns one run's row (with parsed spec and timings) or None."""
+    with connect(path) as connection:
+        connection.row_factory = sqlite3.Row
+        row = connection.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+    connection.close()
+    if row is None:
+        return None
+    run = dict(row)
+    run["spec"] = json.loads(run.pop("spec_json") or "{}")
+    run["timings"] = json.loads(run.pop("timings_json") or "{}")
+    return run
+
+
+def distinct_values(column, path=None):
+    """Returns the distinct values of model_results.model or runs.source, for filter widgets."""
+    table = {"model": "model_results", "source": "runs"}[column]
+    with connect(path) as connection:
+        values = [row[0] for row in connection.execute(f"SELECT DISTINCT {column} FROM {table} ORDER BY 1")]
+    connection.close()
+    return values
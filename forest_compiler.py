@@ -0,0 +1,204 @@
+"""
+Compiled, array-backed format for fitted RandomForest/ExtraTrees classifiers.
+
+Every tree of a fitted forest is flattened into shared contiguous arrays
+(feature, threshold, children, leaf class probabilities) saved as .npy files,
+so a compiled forest loads with np.load(mmap_mode="r") instead of unpickling
+and scores whole batches with vectorized numpy indexing.
+
+Usage:
+    python forest_compiler.py saved_models
+"""
+import os
+import sys
+import json
+import glob
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+
+import model_io
+
+
+FORMAT_VERSION = 1
+COMPILED_SUFFIX = "_compiled"
+ARRAY_NAMES = ("feature", "threshold", "children", "value", "roots", "classes")
+EVAL_CHUNK_SIZE = 8192
+
+
+def is_compilable(model):
+    """Returns True for fitted forests this module can flatten."""
+    return isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)) and hasattr(model, "estimators_")
+
+
+def compiled_path(model_path):
+    """Returns the directory a compiled copy of a pickled model is stored in."""
+    return os.path.splitext(model_path)[0] + COMPILED_SUFFIX
+
+
+def compile_forest(model):
+    """
+    Flattens a fitted forest into a dict of contiguous arrays.
+
+    Node indices are global across trees. children[node] holds the (left,
+    right) pair and leaves point to themselves, so a leaf is a node whose
+    left child is itself.
+    """
+    if not is_compilable(model):
+        raise TypeError(f"Cannot compile {type(model).__name__}; expected a fitted RandomForest or ExtraTrees classifier.")
+    if model.n_outputs_ != 1:
+        raise ValueError("Only single-output forests can be compiled.")
+
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    node_counts = np.array([tree.node_count for tree in trees])
+    roots = np.concatenate([[0], np.cumsum(node_counts)[:-1]]).astype(np.int32)
+
+    feature, threshold, children, value = [], [], [], []
+    for tree, offset in zip(trees, roots):
+        is_leaf = tree.children_left == -1
+        own_index = np.arange(tree.node_count) + offset
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        children.append(np.column_stack([
+            np.where(is_leaf, own_index, tree.children_left + offset),
+            np.where(is_leaf, own_index, tree.children_right + offset),
+        ]))
+
+        # Store per-node class probabilities, as DecisionTreeClassifier.predict_proba does
+        counts = tree.value[:, 0, :]
+        normalizer = counts.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        value.append(counts / normalizer)
+
+    arrays = {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "children": np.ascontiguousarray(np.concatenate(children), dtype=np.int32),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": roots,
+        # Object label arrays (e.g. from a pandas Target column) cannot be saved without pickle
+        "classes": np.array(np.asarray(model.classes_).tolist()),
+    }
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "estimator": type(model).__name__,
+        "n_features": int(model.n_features_in_),
+        "max_depth": int(max(tree.max_depth for tree in trees)),
+        "feature_names": [str(name) for name in getattr(model, "feature_names_in_", [])] or None,
+    }
+    return arrays, meta
+
+
+def export_forest(model, directory):
+    """
+    Compiles a forest and writes its arrays and metadata to a directory.
+
+    Files are written to a staging directory that then replaces the old one,
+    so existing files are never rewritten in place. Loaded CompiledForests
+    memory-map them, and truncating a mapped file crashes the reader (SIGBUS).
+    """
+    arrays, meta = compile_forest(model)
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(staging, f"{name}.npy"), arrays[name], allow_pickle=False)
+        with open(os.path.join(staging, "meta.json"), "w") as meta_file:
+            json.dump(meta, meta_file)
+        if os.path.isdir(directory):
+            # A directory cannot be renamed over a non-empty one; move the old export aside first.
+            # Open maps keep the retired files' inodes alive after they are unlinked.
+            retired = f"{staging}-retired"
+            os.rename(directory, retired)
+            os.rename(staging, directory)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.rename(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return directory
+
+
+class CompiledForest:
+    """
+    Vectorized evaluator over compiled forest arrays.
+
+    Exposes classes_, n_features_in_, predict_proba and predict so it can
+    stand in for the original estimator wherever the app scores rows.
+    """
+
+    def __init__(self, arrays, meta):
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self.classes_ = self.classes
+        self.n_features_in_ = meta["n_features"]
+        self.max_depth = meta["max_depth"]
+        if meta.get("feature_names"):
+            self.feature_names_in_ = np.asarray(meta["feature_names"], dtype=object)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """Opens a compiled forest; arrays are memory-mapped by default."""
+        with open(os.path.join(directory, "meta.json")) as meta_file:
+            meta = json.load(meta_file)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled forest version: {meta.get('format_version')}")
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in ARRAY_NAMES
+        }
+        # Labels are tiny and compared against Python values, so keep them in memory
+        arrays["classes"] = np.array(arrays["classes"])
+        return cls(arrays, meta)
+
+    def _predict_proba_chunk(self, X):
+        # One entry per (tree, row) pair; only pairs not yet at a leaf are advanced.
+        # Tree-major order keeps consecutive lookups inside one tree's nodes.
+        n_rows, n_trees = len(X), len(self.roots)
+        flat_X = X.ravel()
+        flat_children = self.children.ravel()
+        nodes = np.repeat(self.roots, n_rows)
+        row_offset = np.tile(np.arange(n_rows, dtype=np.int32) * X.shape[1], n_trees)
+        active = np.flatnonzero(flat_children[2 * nodes] != nodes)
+        for _ in range(self.max_depth):
+            if not active.size:
+                break
+            current = nodes[active]
+            go_right = ~(flat_X[row_offset[active] + self.feature[current]] <= self.threshold[current])
+            current = flat_children[2 * current + go_right]
+            nodes[active] = current
+            active = active[flat_children[2 * current] != current]
+        return self.value[nodes].reshape(n_trees, n_rows, -1).mean(axis=0)
+
+    def predict_proba(self, X):
+        # Trees compare float32 inputs against float64 thresholds, like sklearn
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[-1]} features, but the compiled forest is expecting {self.n_features_in_} features as input.")
+        chunks = [
+            self._predict_proba_chunk(X[start:start + EVAL_CHUNK_SIZE])
+            for start in range(0, len(X), EVAL_CHUNK_SIZE)
+        ]
+        return np.vstack(chunks) if chunks else np.empty((0, len(self.classes_)))
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def compile_saved_models(directory=model_io.SAVED_MODELS_DIR):
+    """Compiles every forest pickle in a saved models directory. Returns the written paths."""
+    written = []
+    for model_path in sorted(glob.glob(os.path.join(directory, "*.pkl"))):
+        model = model_io.load_artifact(model_path)
+        if is_compilable(model):
+            written.append(export_forest(model, compiled_path(model_path)))
+    return written
+
+
+if __name__ == "__main__":
+    for path in compile_saved_models(*sys.argv[1:2]):
+        print(f"Compiled {path}")
@@ -0,0 +1,210 @@
+"""
+Seeded, parallel synthetic data generation.
+
+All randomness comes from one numpy SeedSequence built from the user's seed.
+It is spawned into one child per class, and each class's child is spawned into
+one stream per chunk of GENERATION_CHUNK_ROWS rows. A separate child draws the
+row shuffle. Chunk boundaries depend only on the class sizes, never on the
+worker count, so a seed always produces bit-identical data however many
+threads fill it.
+
+Chunks are filled by a thread pool sized from the shared compute budget. numpy
+releases the GIL while drawing, and each chunk writes its shuffled rows
+straight into one preallocated feature matrix, so no per-class arrays are
+stacked or copied afterwards.
+
+Features can follow any distribution registered in distributions.py; each
+(class, distribution) group of features is drawn in one vectorized call.
+Classes may carry a correlation matrix among their normal features. Their
+covariance diag(std) R diag(std) is factored once (Cholesky, cached per
+parameter set) and every chunk is correlated with a single matrix multiply of
+standard normal draws.
+"""
+import os
+import hashlib
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import compute_scheduler
+import distributions
+
+
+GENERATION_CHUNK_ROWS = int(os.environ.get("GENERATION_CHUNK_ROWS", 65_536))
+
+
+def class_counts(total_sample_size, n_classes):
+    """Splits the sample size across classes; the first classes get the remainder."""
+    counts = np.full(n_classes, total_sample_size // n_classes)
+    counts[:total_sample_size % n_classes] += 1
+    return counts
+
+
+def plan_chunks(counts, chunk_rows=GENERATION_CHUNK_ROWS):
+    """Returns (class index, start row, stop row) chunks in class-ordered row positions."""
+    chunks = []
+    start = 0
+    for class_index, count in enumerate(counts):
+        for offset in range(0, int(count), chunk_rows):
+            chunks.append((class_index, start + offset, start + min(offset + chunk_rows, int(count))))
+        start += int(count)
+    return chunks
+
+
+def is_identity(correlation):
+    return correlation is None or np.array_equal(np.asarray(correlation, dtype=np.float64), np.eye(len(correlation)))
+
+
+@lru_cache(maxsize=128)
+def _cholesky(stds, correlation):
+    covariance = np.asarray(correlation) * np.outer(stds, stds)
+    try:
+        factor = np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix must be symmetric and positive definite.")
+    # Shared between threads and calls, so keep it immutable
+    factor.setflags(write=False)
+    return factor
+
+
+def cholesky_factor(stds, correlation):
+    """
+    Returns the lower Cholesky factor L of diag(stds) @ correlation @ diag(stds), cached per parameter set.
+
+    Raises ValueError if the correlation matrix is not symmetric positive definite.
+    """
+    correlation = np.asarray(correlation, dtype=np.float64)
+    if correlation.shape != (len(stds), len(stds)) or not np.allclose(correlation, correlation.T):
+        raise ValueError("Correlation matrix must be square, symmetric and match the number of features.")
+    return _cholesky(tuple(float(std) for std in stds), tuple(map(tuple, correlation.tolist())))
+
+
+def resize_correlation(correlation, n_features):
+    """Returns an n_features x n_features correlation, keeping the existing top-left block and padding with identity."""
+    resized = np.eye(n_features)
+    if correlation is not None:
+        keep = min(n_features, len(correlation))
+        resized[:keep, :keep] = np.asarray(correlation, dtype=np.float64)[:keep, :keep]
+    return resized
+
+
+def _class_plan(features, means, stds, correlation, feature_specs):
+    """Precomputes one class's normal columns, scale or Cholesky factor and non-normal feature groups."""
+    means = np.asarray(means, dtype=np.float64)
+    stds = np.asarray(stds, dtype=np.float64)
+    specs = {features.index(name): spec for name, spec in (feature_specs or {}).items() if name in features}
+    for index, spec in specs.items():
+        if spec.get("type", distributions.NORMAL) == distributions.NORMAL:
+            # An explicit normal spec overrides the class's mean and std for that feature
+            params = distributions.validate(spec)
+            means[index], stds[index] = params["mean"], params["std"]
+
+    groups = []
+    for name, members in distributions.group_features(specs).items():
+        distribution = distributions.get(name)
+        columns = np.asarray([index for index, _ in members])
+        groups.append((columns, distribution, distribution.stack([spec for _, spec in members])))
+    grouped = {int(index) for columns, _, _ in groups for index in columns}
+    normal = np.asarray([index for index in range(len(features)) if index not in grouped], dtype=int)
+
+    factor = None
+    if not is_identity(correlation):
+        correlation = np.asarray(correlation, dtype=np.float64)[np.ix_(normal, normal)]
+        if not is_identity(correlation):
+            # Transposed, so a chunk of draws is correlated with one right-multiply
+            factor = cholesky_factor(stds[normal], correlation).T
+    return {"normal": normal, "mean": means[normal], "std": stds[normal], "factor": factor, "groups": groups}
+
+
+def generate(features, classes, total_sample_size, mean_values_dict, std_values_dict, seed=None,
+             n_workers=None, chunk_rows=GENERATION_CHUNK_ROWS, correlation_dict=None, distribution_dict=None):
+    """
+    Draws normally distributed rows for every class; returns shuffled (X, y).
+
+    Args:
+        seed: Integer seed; None draws fresh entropy.
+        correlation_dict: Optional {class name: feature correlation matrix};
+            classes without one (or with the identity) get independent features.
+            It applies to the class's normal features.
+        distribution_dict: Optional {class name: {feature name: feature spec}}
+            selecting a registered distribution per feature (see
+            distributions.py). Unlisted features are normal with the class's
+            mean and std.
+        n_workers: Threads to request from the compute budget (all free cores
+            if None). The result does not depend on it.
+
+    Returns:
+        X: float64 array of shape (total_sample_size, len(features)).
+        y: object array of class names.
+    """
+    n_features = len(features)
+    counts = class_counts(total_sample_size, len(classes))
+    chunks = plan_chunks(counts, chunk_rows)
+
+    root = np.random.SeedSequence(seed)
+    class_seeds = root.spawn(len(classes) + 1)
+    shuffle_seed = class_seeds.pop()
+    # Chunks are listed class by class, matching the order of these streams
+    chunk_seeds = []
+    for class_index, count in enumerate(counts):
+        chunk_seeds.extend(class_seeds[class_index].spawn(-(-int(count) // chunk_rows)))
+
+    # Row i of the class-ordered data lands at position order[i] of the output
+    order = np.random.default_rng(shuffle_seed).permutation(total_sample_size)
+    correlation_dict = correlation_dict or {}
+    distribution_dict = distribution_dict or {}
+    plans = [
+        _class_plan(
+            features, mean_values_dict[class_name], std_values_dict[class_name],
+            correlation_dict.get(class_name), distribution_dict.get(class_name)
+        )
+        for class_name in classes
+    ]
+    X = np.empty((total_sample_size, n_features))
+
+    def fill(chunk, chunk_seed):
+        class_index, start, stop = chunk
+        plan = plans[class_index]
+        rng = np.random.default_rng(chunk_seed)
+        values = rng.standard_normal((stop - start, len(plan["normal"])))
+        if plan["factor"] is None:
+            values *= plan["std"]
+        else:
+            values = values @ plan["factor"]
+        values += plan["mean"]
+        if plan["groups"]:
+            block = np.empty((stop - start, n_features))
+            block[:, plan["normal"]] = values
+            # One vectorized draw per distribution, always in the same order
+            for columns, distribution, params in plan["groups"]:
+                block[:, columns] = distribution.sampler(rng, stop - start, params)
+            values = block
+        X[order[start:stop]] = values
+
+    with compute_scheduler.allocate(n_workers, label="generate") as granted:
+        if granted <= 1 or len(chunks) <= 1:
+            for chunk, chunk_seed in zip(chunks, chunk_seeds):
+                fill(chunk, chunk_seed)
+        else:
+            with ThreadPoolExecutor(max_workers=min(granted, len(chunks))) as executor:
+                list(executor.map(fill, chunks, chunk_seeds))
+
+    y = np.empty(total_sample_size, dtype=object)
+    y[order] = np.repeat(np.asarray(classes, dtype=object), counts)
+    return X, y
+
+
+def default_class_params(class_name, n_features, seed=0):
+    """
+    Returns reproducible default (means, stds) for a class.
+
+    Values depend only on the seed, the class name and the feature position, so
+    adding a feature appends values without changing the existing ones.
+    """
+    class_key = int.from_bytes(hashlib.sha256(class_name.encode("utf-8")).digest()[:8], "little")
+    mean_rng = np.random.default_rng([seed, class_key, 0])
+    std_rng = np.random.default_rng([seed, class_key, 1])
+    means = mean_rng.uniform(50, 150, n_features).tolist()
+    stds = np.round(std_rng.uniform(5.0, 15.0, n_features), 1).tolist()
+    return means, stds
@@ -0,0 +1,285 @@
+"""
+Local HTTP inference service for models written by save_models.
+
+Loads every *_scaled.pkl / *_scaler.pkl pair from the saved models directory
+once and coalesces concurrent single-row requests into vectorized
+micro-batches.
+
+Usage:
+    python inference_server.py --models-dir saved_models --port 8502
+
+Endpoints:
+    GET  /models                 Available models and their feature names.
+    GET  /metrics                Throughput, batch and latency counters.
+    POST /predict/<model name>   Body: {"features": [...]} or {"features": {name: value}}.
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import numpy as np
+
+import model_io
+import forest_compiler
+
+
+class UnknownModelError(LookupError):
+    """Raised for a model name that is not being served."""
+
+
+class LatencyStats:
+    """Thread-safe request counters with a rolling window for latency percentiles."""
+
+    def __init__(self, window=10_000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_rows = 0
+
+    def record_request(self, latency, failed=False):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(failed)
+            self._latencies.append(latency)
+
+    def record_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batched_rows += size
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            uptime = time.perf_counter() - self._started
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "batches": self.batches,
+                "mean_batch_size": self.batched_rows / self.batches if self.batches else 0.0,
+                "uptime_s": round(uptime, 3),
+                "throughput_rps": self.requests / uptime if uptime else 0.0,
+                "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            }
+
+
+class MicroBatcher:
+    """
+    Collects single-row requests for one model and scores them together.
+
+    A batch is dispatched once max_batch_size rows are waiting or max_wait
+    seconds have passed since its first row arrived, whichever comes first.
+    """
+
+    def __init__(self, model, scaler, stats, max_batch_size=64, max_wait=0.005):
+        self.model = model
+        self.scaler = scaler
+        self.stats = stats
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, row):
+        """Queues one feature row and returns a Future for (label, probabilities)."""
+        future = Future()
+        self._queue.put((row, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self, rows):
+        X = np.asarray(rows, dtype=np.float64)
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        return model_io.predict_with_proba(self.model, X)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            rows = [row for row, _ in batch]
+            futures = [future for _, future in batch]
+            try:
+                labels, probabilities = self._score(rows)
+            except Exception:
+                # Score the rows one by one so only the request that broke the batch fails
+                for row, future in batch:
+                    try:
+                        labels, probabilities = self._score([row])
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result((labels[0], None if probabilities is None else probabilities[0]))
+                self.stats.record_batch(len(batch))
+                continue
+
+            self.stats.record_batch(len(batch))
+            for idx, future in enumerate(futures):
+                future.set_result((labels[idx], None if probabilities is None else probabilities[idx]))
+
+
+class InferenceService:
+    """Holds one MicroBatcher per saved model pair."""
+
+    def __init__(self, models_dir=model_io.SAVED_MODELS_DIR, max_batch_size=64, max_wait=0.005, use_compiled=True):
+        self.stats = LatencyStats()
+        self.models = {}
+        for model_name, (model_path, scaler_path) in model_io.list_saved_models(models_dir).items():
+            compiled_dir = forest_compiler.compiled_path(model_path)
+            if use_compiled and os.path.isdir(compiled_dir):
+                model = forest_compiler.CompiledForest.load(compiled_dir)
+            else:
+                model = model_io.load_artifact(model_path, mmap_mode="r")
+            scaler = model_io.load_artifact(scaler_path)
+            self.models[model_name] = {
+                "batcher": MicroBatcher(model, scaler, self.stats, max_batch_size, max_wait),
+                "feature_names": model_io.expected_feature_names(model, scaler),
+                "n_features": getattr(scaler, "n_features_in_", None) or getattr(model, "n_features_in_", None),
+                "classes": [str(label) for label in model.classes_],
+            }
+
+    def describe(self):
+        return {
+            name: {"feature_names": entry["feature_names"], "classes": entry["classes"]}
+            for name, entry in self.models.items()
+        }
+
+    @staticmethod
+    def _validate_row(entry, features):
+        """Returns the request's features as one float row; raises ValueError if they cannot be scored."""
+        if isinstance(features, dict):
+            if entry["feature_names"] is None:
+                raise ValueError("This model has no feature names; send features as a list.")
+            model_io.validate_columns(features, entry["feature_names"])
+            features = [features[name] for name in entry["feature_names"]]
+        if not isinstance(features, (list, tuple)) or not all(
+            isinstance(value, (int, float)) and not isinstance(value, bool) for value in features
+        ):
+            raise ValueError("features must be a flat list of numbers or an object of numbers.")
+        # json.loads accepts NaN and Infinity, and 1e400 parses to inf
+        if not all(math.isfinite(value) for value in features):
+            raise ValueError("features must be finite numbers.")
+        if entry["n_features"] is not None and len(features) != entry["n_features"]:
+            raise ValueError(f"Expected {entry['n_features']} features, got {len(features)}.")
+        return [float(value) for value in features]
+
+    def predict(self, model_name, features):
+        entry = self.models.get(model_name)
+        if entry is None:
+            raise UnknownModelError(f"Unknown model: {model_name}")
+        # Reject bad rows here, so one malformed request cannot fail the whole micro-batch it joins
+        row = self._validate_row(entry, features)
+
+        label, probabilities = entry["batcher"].submit(row).result()
+        response = {"prediction": label.item() if hasattr(label, "item") else label}
+        if probabilities is not None:
+            response["probabilities"] = dict(zip(entry["classes"], probabilities.tolist()))
+        return response
+
+
+class InferenceHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections under concurrent load
+    request_queue_size = 1024
+
+
+def make_handler(service):
+    class InferenceHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/models":
+                self._send_json(200, service.describe())
+            elif self.path == "/metrics":
+                self._send_json(200, service.stats.snapshot())
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if not self.path.startswith("/predict/"):
+                self._send_json(404, {"error": "Not found"})
+                return
+
+            start_time = time.perf_counter()
+            failed = True
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict) or "features" not in payload:
+                    raise ValueError('Request body must be a JSON object with a "features" field.')
+                model_name = unquote(self.path[len("/predict/"):])
+                response = service.predict(model_name, payload["features"])
+                failed = False
+                self._send_json(200, response)
+            except UnknownModelError as e:
+                self._send_json(404, {"error": str(e)})
+            except Exception as e:
+                self._send_json(400, {"error": str(e)})
+            finally:
+                service.stats.record_request(time.perf_counter() - start_time, failed)
+
+        def log_message(self, format, *args):
+            # Per-request logging would dominate latency at high QPS
+            pass
+
+    return InferenceHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve saved models over HTTP with micro-batching.")
+    parser.add_argument("--models-dir", default=model_io.SAVED_MODELS_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--no-compiled", action="store_true", help="Serve forest pickles instead of compiled forests.")
+    args = parser.parse_args(argv)
+
+    # Scalers are fit on DataFrames but served plain arrays in the batch loop
+    warnings.filterwarnings("ignore", category=UserWarning, message=".*valid feature names.*")
+
+    service = InferenceService(args.models_dir, args.max_batch_size, args.max_wait_ms / 1000, not args.no_compiled)
+    if not service.models:
+        parser.error(f"No model/scaler pairs found in {args.models_dir}")
+
+    server = InferenceHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving {len(service.models)} models on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Background job runner for long training runs.
+
+Jobs run on a process-wide thread pool, outside the Streamlit script thread, so
+widget changes and reruns no longer abort them. Each job has an ID that the
+page keeps in its URL; after a refresh the page looks the job up again and
+either resumes polling or shows its stored result.
+
+Job bodies receive their Job as the first argument and call job.report() to
+publish progress. report() is also the cancellation point: once a job has been
+cancelled, the next report() raises JobCancelled.
+
+Jobs can carry a key. Submitting a key that matches a queued, running or
+finished job returns that job instead of starting a new one, so identical
+experiments from several sessions share a single run and its result (and a
+cancellation). Finished jobs are kept for JOB_RESULT_TTL_S, and at most
+MAX_FINISHED_JOBS of them are retained, so inputs and results should stay
+small: persist large artifacts (datasets, fitted models) from the job body and
+keep only what is needed to find them again.
+"""
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_RESULT_TTL_S = 60 * 60
+MAX_FINISHED_JOBS = 32
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised inside a job body when the job has been cancelled."""
+
+
+class Job:
+    """State of one background job; progress and status are safe to read from any thread."""
+
+    def __init__(self, label, key=None, inputs=None):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.key = key
+        self.inputs = inputs or {}
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel_requested = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def report(self, progress, message=None):
+        """Publishes progress (0-1); raises JobCancelled if the job has been cancelled."""
+        self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        if self._cancel_requested.is_set():
+            raise JobCancelled()
+
+    def cancel(self):
+        """Requests cancellation; the job stops at its next report()."""
+        self._cancel_requested.set()
+
+    def wait(self, timeout=None):
+        """Blocks until the job finishes or timeout passes; returns True if it finished."""
+        return self._finished.wait(timeout)
+
+    def _finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self._finished.set()
+
+
+class JobRunner:
+    """Runs jobs on a thread pool and keeps them addressable by ID."""
+
+    def __init__(self, workers=JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, label="job", key=None, inputs=None, **kwargs):
+        """
+        Queues func(job, *args, **kwargs) and returns its Job.
+
+        If key matches a job that has not failed or been cancelled, that job is
+        returned instead.
+        """
+        with self._lock:
+            self._prune()
+            if key is not None:
+                for job in self._jobs.values():
+                    if job.key == key and job.status not in (FAILED, CANCELLED):
+                        return job
+            job = Job(label, key, inputs)
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        if job._cancel_requested.is_set():
+            job._finish(CANCELLED)
+            return
+        job.status = RUNNING
+        try:
+            result = func(job, *args, **kwargs)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except Exception as e:
+            job._finish(FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            job.progress = 1.0
+            job._finish(DONE, result=result)
+
+    def get(self, job_id):
+        """Returns the job with this ID, or None if it is unknown or expired."""
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def stats(self):
+        """Returns the number of jobs in each status."""
+        with self._lock:
+            counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RESULT_TTL_S
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished:
+            if job.finished_at < cutoff:
+                del self._jobs[job.job_id]
+        finished = [job for job in finished if job.job_id in self._jobs]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.job_id]
+
+
+def get_runner():
+    """Returns the process-wide job runner."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -2,7 +2,7 @@ import streamlit as st
 import importlib.util
 
 # Import the necessary files
-from pages import app, AlgorithmEducation, ModelImplementation
+from pages import app, AlgorithmEducation, ModelImplementation, ExperimentLog, StreamingSimulation
 
 st.set_page_config(page_title="Synthetic Data Generation", page_icon="🗃️")
 
@@ -17,6 +17,8 @@ file_functions = {
     "app.py": (app.main, "app"), 
     "Algorithm Education.py": (AlgorithmEducation.run, "Algorithm Education"),  
     "Model Implementation.py":  (ModelImplementation.main, "Model Implementation"),
+    "Experiment Log.py": (ExperimentLog.main, "Experiment Log"),
+    "Streaming Simulation.py": (StreamingSimulation.main, "Streaming Simulation"),
 }
 
 # App Title
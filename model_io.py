@@ -0,0 +1,158 @@
+import os
+import glob
+import hashlib
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+
+
+SAVED_MODELS_DIR = "saved_models"
+BATCH_CHUNK_SIZE = 50_000
+
+
+def content_digest(data):
+    """Returns a SHA-256 hex digest for a bytes payload."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_artifact(source, mmap_mode=None):
+    """
+    Loads a joblib pickle from a path or file-like object.
+
+    Args:
+        source: File path or binary file-like object.
+        mmap_mode: Passed to joblib so large numpy arrays are memory-mapped
+            instead of copied. Only has an effect for paths on disk.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return joblib.load(source, mmap_mode=mmap_mode)
+    return joblib.load(source)
+
+
+def dump_artifact(obj, path):
+    """
+    Writes a joblib pickle to a temporary file and renames it over path.
+
+    Sessions may hold memory maps of the current file (load_artifact with
+    mmap_mode). Replacing it gives the new pickle a new inode, so those maps
+    keep reading the old data instead of pages truncated under them.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-", suffix=".pkl")
+    os.close(fd)
+    try:
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def file_signature(path):
+    """Returns a cheap identity for a file on disk (path, size, mtime)."""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def list_saved_models(directory=SAVED_MODELS_DIR):
+    """
+    Lists model/scaler pairs written by save_models.
+
+    Returns a dict of model name -> (scaled model path, scaler path).
+    """
+    pairs = {}
+    for model_path in sorted(glob.glob(os.path.join(directory, "*_scaled.pkl"))):
+        model_name = os.path.basename(model_path)[: -len("_scaled.pkl")]
+        scaler_path = os.path.join(directory, f"{model_name}_scaler.pkl")
+        if os.path.exists(scaler_path):
+            pairs[model_name] = (model_path, scaler_path)
+    return pairs
+
+
+def predict_with_proba(model, X):
+    """
+    Scores X with a single model evaluation.
+
+    Labels are derived from predict_proba when the model supports it, so
+    ensembles are not evaluated twice. Returns (labels, probabilities), where
+    probabilities is None for models without predict_proba.
+    """
+    if hasattr(model, "predict_proba"):
+        probabilities = model.predict_proba(X)
+        return model.classes_[probabilities.argmax(axis=1)], probabilities
+    return model.predict(X), None
+
+
+def expected_feature_names(model, scaler=None):
+    """Returns the feature names seen at fit time by the model or its scaler, if any."""
+    for estimator in (model, scaler):
+        names = getattr(estimator, "feature_names_in_", None)
+        if names is not None:
+            return [str(name) for name in names]
+    return None
+
+
+def validate_columns(columns, feature_names):
+    """Raises ValueError if any expected feature column is missing."""
+    missing = [name for name in feature_names if name not in columns]
+    if missing:
+        raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+
+
+def iter_feature_chunks(source, file_name, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Yields DataFrame chunks of at most chunk_size rows from a CSV or Parquet file.
+
+    Args:
+        source: Path or binary file-like object.
+        file_name: Name used to pick the reader from its extension.
+        chunk_size: Maximum number of rows held in memory at once.
+    """
+    if file_name.lower().endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow).")
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size)
+
+
+def score_chunk(model, scaler, frame, feature_names):
+    """Scales and scores one chunk, returning the class and per-class probabilities."""
+    X = frame[feature_names].astype(np.float64)
+    if scaler is not None and hasattr(scaler, "transform"):
+        X = scaler.transform(X)
+    labels, probabilities = predict_with_proba(model, X)
+
+    scored = pd.DataFrame({"Predicted Class": labels}, index=frame.index)
+    if probabilities is not None:
+        for idx, class_label in enumerate(model.classes_):
+            scored[f"P({class_label})"] = probabilities[:, idx]
+    return scored
+
+
+def score_batches(model, scaler, chunks, feature_names, output, progress=None):
+    """
+    Scores chunks one at a time and streams the results to a CSV file.
+
+    Args:
+        chunks: Iterable of feature DataFrames, e.g. from iter_feature_chunks.
+        output: Path of the CSV file to write.
+        progress: Optional callback receiving the number of rows scored so far.
+
+    Returns the total number of rows scored.
+    """
+    rows_scored = 0
+    with open(output, "w", newline="") as output_file:
+        for chunk in chunks:
+            if rows_scored == 0:
+                validate_columns(chunk.columns, feature_names)
+            scored = score_chunk(model, scaler, chunk, feature_names)
+            scored.to_csv(output_file, header=rows_scored == 0, index=False)
+            rows_scored += len(chunk)
+            if progress:
+                progress(rows_scored)
+    return rows_scored
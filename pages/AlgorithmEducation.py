@@ -1,20 +1,39 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.datasets import load_iris, load_wine, load_digits
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier, ExtraTreesClassifier
-from sklearn.naive_bayes import GaussianNB, MultinomialNB
-from sklearn.svm import SVC
-from sklearn.neural_network import MLPClassifier
-from sklearn.model_selection import learning_curve
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+import os
 import warnings
+import demo_bundle
+import model_io
+import rendering
 
 warnings.filterwarnings("ignore", category=UserWarning, message=".*ScriptRunContext.*")
 
+@st.cache_resource(show_spinner=False)
+def load_demo_results(bundle_signature):
+    """Loads the precomputed demo bundle once per bundle file version."""
+    return demo_bundle.load_bundle() or {}
+
+
+@st.cache_data(show_spinner=False)
+def load_demo_dataset(dataset_option):
+    """Loads a bundled dataset once, with the target column renamed to Label."""
+    return demo_bundle.load_demo_dataset(dataset_option)
+
+
+@st.cache_data(show_spinner=False)
+def get_demo_result(algorithm, dataset_option, bundle_signature):
+    """Returns bundled results, training live only when the bundle is missing or stale."""
+    result = load_demo_results(bundle_signature).get((algorithm, dataset_option))
+    if result is None:
+        result = demo_bundle.compute_demo_result(algorithm, dataset_option)
+    return result
+
+
+def current_bundle_signature():
+    if not os.path.exists(demo_bundle.BUNDLE_PATH):
+        return None
+    return model_io.file_signature(demo_bundle.BUNDLE_PATH)
+
 def run():
 # Streamlit App Title
     st.title("📚 Machine Learning Algorithms Guide 📊")
@@ -218,82 +237,37 @@ def run():
 
     # Dataset Selection
     dataset_option = st.selectbox(
-        "Select a dataset for the demo: 📑", ["Iris Dataset", "Wine Dataset", "Digits Dataset"]
+        "Select a dataset for the demo: 📑", list(demo_bundle.DEMO_DATASETS)
     )
 
-# Generate data based on the dataset optio
-    if dataset_option == "Iris Dataset":
-        iris = load_iris(as_frame=True)
-        data = iris.frame
-        data.rename(columns={"target": "Label"}, inplace=True)
-
-    elif dataset_option == "Wine Dataset":
-        wine = load_wine(as_frame=True)
-        data = wine.frame
-        data.rename(columns={"target": "Label"}, inplace=True)
-
-    elif dataset_option == "Digits Dataset":
-        digits = load_digits(as_frame=True)
-        data = digits.frame
-        data.rename(columns={"target": "Label"}, inplace=True)
+    data = load_demo_dataset(dataset_option)
 
     st.write("🔍 Data Sample:")
     st.dataframe(data.head())
 
-    # Split dataset for training and testing
-    X = data.drop(columns=["Label"])
-    y = data["Label"]
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
-
-    # Model selection for the demo
-    model_dict = {
-        "Gaussian Naive Bayes": GaussianNB(),
-        "Multinomial Naive Bayes": MultinomialNB(),
-        "AdaBoost Classifier": AdaBoostClassifier(),
-        "Random Forest Classifier": RandomForestClassifier(),
-        "Support Vector Classification": SVC(),
-        "Multi-layer Perceptron": MLPClassifier(),
-        "Extra Trees Classifier": ExtraTreesClassifier()
-    }
-
-# Fit the selected model (based on user selection)
-    model = model_dict.get(algorithm)
-    model.fit(X_train, y_train)
-
-    y_pred = model.predict(X_test)
-    accuracy = accuracy_score(y_test, y_pred)
+# Results for the selected model (precomputed, or trained once and cached)
+    demo_result = get_demo_result(algorithm, dataset_option, current_bundle_signature())
+    accuracy = demo_result["accuracy"]
+    report_dict = demo_result["report"]
+    cm = demo_result["confusion_matrix"]
+    class_labels = demo_result["classes"]
     st.subheader("📝 Performance Metrics:")
     st.markdown(f"**Accuracy**: {accuracy:.2f}") 
     st.write("**Classification Report:**")
-    report_dict = classification_report(y_test, y_pred, output_dict=True)  
     report_df = pd.DataFrame(report_dict).transpose()  
     st.dataframe(report_df.style.format(precision=2))
 
 # Confusion Matrix
     st.subheader("📊 Confusion Matrix:")
-    cm = confusion_matrix(y_test, y_pred)
-    fig, ax = plt.subplots(figsize=(4, 4))
-    sns.heatmap(cm, annot=True, fmt="d", cmap="Blues", xticklabels=model.classes_, yticklabels=model.classes_)
-    plt.xlabel("Predicted")
-    plt.ylabel("True")
-    st.pyplot(fig)
+    st.image(rendering.confusion_matrix_png(cm, class_labels))
 
 # Learning Curve Plot
     st.subheader("📈 Learning Curve:")
-    train_sizes, train_scores, test_scores = learning_curve(
-        model, X, y, cv=5, scoring='accuracy', train_sizes=np.linspace(0.1, 1.0, 5)
-    )
-    train_mean = train_scores.mean(axis=1)
-    test_mean = test_scores.mean(axis=1)
-
-    plt.figure(figsize=(4, 4))
-    plt.plot(train_sizes, train_mean, label="Training accuracy", color="blue")
-    plt.plot(train_sizes, test_mean, label="Cross-validation score", color="green")
-    plt.xlabel("Training Set Size")
-    plt.ylabel("Accuracy")
-    plt.title("Learning Curve")
-    plt.legend(loc="best")
-    st.pyplot(plt)
+    st.image(rendering.learning_curve_png({
+        "train_sizes": demo_result["train_sizes"],
+        "train_scores_mean": demo_result["train_mean"],
+        "test_scores_mean": demo_result["test_mean"],
+    }))
 if __name__ == "__main__":
     run()
 
@@ -0,0 +1,108 @@
+import streamlit as st
+import time
+import plotly.express as px
+import experiment_log
+import session_memory
+
+
+QUERY_CACHE_TTL_S = 30
+LOOKBACK_OPTIONS = {"Last 24 hours": 1, "Last 7 days": 7, "Last 30 days": 30, "All time": None}
+
+
+@st.cache_data(ttl=QUERY_CACHE_TTL_S, show_spinner=False)
+def load_results(models, sources, since, min_accuracy, limit):
+    """Runs one filtered, indexed query against the experiment log; cached briefly per filter set."""
+    return experiment_log.query_results(
+        models=list(models), sources=list(sources), since=since, min_accuracy=min_accuracy, limit=limit
+    )
+
+
+@st.cache_data(ttl=QUERY_CACHE_TTL_S, show_spinner=False)
+def load_filter_options():
+    return experiment_log.distinct_values("model"), experiment_log.distinct_values("source")
+
+
+def filter_sidebar():
+    """Returns the query filters chosen in the sidebar."""
+    model_options, source_options = load_filter_options()
+    with st.sidebar:
+        st.header("🔎 Filters")
+        models = st.multiselect("Models", model_options)
+        sources = st.multiselect("Sources", source_options)
+        lookback = st.selectbox("Recorded", list(LOOKBACK_OPTIONS), index=1)
+        min_accuracy = st.slider("Minimum Accuracy", 0.0, 1.0, 0.0, 0.01)
+        limit = int(st.number_input("Max Rows", min_value=100, max_value=100000, value=5000, step=100))
+        if st.button("🔄 Refresh"):
+            load_results.clear()
+            load_filter_options.clear()
+
+    days = LOOKBACK_OPTIONS[lookback]
+    # Round to the minute so reruns within a minute reuse the cached query
+    since = (int(time.time() // 60) * 60 - days * 86400) if days else None
+    return tuple(models), tuple(sources), since, (min_accuracy or None), limit
+
+
+def display_model_summary(results_df):
+    st.subheader("🏆 Model Summary")
+    summary = results_df.groupby("model").agg(
+        Runs=("run_id", "nunique"),
+        Mean_Accuracy=("accuracy", "mean"),
+        Best_Accuracy=("accuracy", "max"),
+        Mean_CV_Accuracy=("cv_accuracy", "mean"),
+        Mean_Training_Time_s=("training_time_s", "mean"),
+        Mean_Model_Size=("model_bytes", "mean"),
+    ).sort_values("Mean_Accuracy", ascending=False)
+    summary["Mean_Model_Size"] = summary["Mean_Model_Size"].map(
+        lambda size: session_memory.format_bytes(size) if size == size else "-"
+    )
+    st.dataframe(summary.rename(columns=lambda column: column.replace("_", " ")), use_container_width=True)
+
+
+def display_trends(results_df):
+    st.subheader("📈 Trends")
+    metric = st.selectbox("Metric", ["accuracy", "cv_accuracy", "f1", "training_time_s", "model_bytes"])
+    fig = px.line(
+        results_df.sort_values("recorded_at"), x="recorded_at", y=metric, color="model", markers=True,
+        hover_data=["run_id", "source", "n_rows", "variant"]
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def display_run_details(results_df):
+    st.subheader("🧾 Run Details")
+    run_ids = results_df["run_id"].unique().tolist()
+    run_id = st.selectbox("Run", run_ids)
+    run = experiment_log.get_run(run_id)
+    if run is None:
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("Dataset Spec:")
+        st.json(run["spec"], expanded=False)
+    with col2:
+        st.write("Timings (s):")
+        st.json(run["timings"], expanded=False)
+        st.write(f"Host: {run['host']} · Python {run['python']} · scikit-learn {run['sklearn']} · rev {run['git_rev']}")
+    st.dataframe(results_df[results_df["run_id"] == run_id], use_container_width=True)
+
+
+def main():
+    st.title("🗂️ Experiment Log")
+    st.write(f"Every training run is appended to `{experiment_log.EXPERIMENT_LOG_PATH}`. Filter and compare past runs below.")
+
+    models, sources, since, min_accuracy, limit = filter_sidebar()
+    results_df = load_results(models, sources, since, min_accuracy, limit)
+    if results_df.empty:
+        st.info("No runs match these filters yet. Train models on the app page or run pipeline.py to record some.")
+        return
+
+    st.write(f"{results_df['run_id'].nunique()} runs, {len(results_df)} model results")
+    display_model_summary(results_df)
+    display_trends(results_df)
+    st.subheader("📋 Results")
+    st.dataframe(results_df, use_container_width=True)
+    display_run_details(results_df)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,85 @@
 import streamlit as st
-import random
-import joblib
+import io
 import plotly.express as px
 import time
+import os
+import tempfile
+import model_io
+import session_memory
+import forest_compiler
+
+
+MODEL_CACHE_ENTRIES = 8
+
+
+@st.cache_resource(max_entries=MODEL_CACHE_ENTRIES, show_spinner=False)
+def load_uploaded_artifact(digest, _data):
+    """Deserializes an uploaded pickle once per content hash, shared across sessions."""
+    return model_io.load_artifact(io.BytesIO(_data))
+
+
+@st.cache_resource(max_entries=MODEL_CACHE_ENTRIES, show_spinner=False)
+def load_saved_artifact(signature, path, mmap_mode=None):
+    """Deserializes a server-side pickle once per file version, optionally memory-mapped."""
+    return model_io.load_artifact(path, mmap_mode=mmap_mode)
+
+
+@st.cache_resource(max_entries=MODEL_CACHE_ENTRIES, show_spinner=False)
+def load_compiled_forest(signature, directory):
+    """Opens a compiled forest once per export; its arrays stay memory-mapped."""
+    return forest_compiler.CompiledForest.load(directory)
+
+
+def uploaded_digest(uploaded_file):
+    """Hashes an uploaded file once per upload instead of once per rerun."""
+    digests = st.session_state.setdefault("upload_digests", {})
+    # Only a cache: evicting it costs a rehash
+    session_memory.touch(st.session_state, "upload_digests")
+    if uploaded_file.file_id not in digests:
+        digests[uploaded_file.file_id] = model_io.content_digest(uploaded_file.getvalue())
+    return digests[uploaded_file.file_id]
+
+
+def load_saved_files():
+    saved_models = model_io.list_saved_models()
+    if not saved_models:
+        st.sidebar.info("📂 No saved models found. Train models on the app page first.")
+        return None, None, None
+
+    model_name = st.sidebar.selectbox("Select Saved Model", options=list(saved_models.keys()))
+    use_mmap = st.sidebar.checkbox("Memory-map large arrays", value=True)
+    mmap_mode = "r" if use_mmap else None
+    model_path, scaler_path = saved_models[model_name]
+    compiled_dir = forest_compiler.compiled_path(model_path)
+    use_compiled = os.path.isdir(compiled_dir) and st.sidebar.checkbox(
+        "Use compiled forest for single predictions", value=True
+    )
+
+    try:
+        with st.spinner("Loading files..."):
+            # Batch files are always scored with the pickled estimator: past a few hundred rows
+            # sklearn's predict_proba is faster than the compiled forest
+            batch_model = load_saved_artifact(model_io.file_signature(model_path), model_path, mmap_mode)
+            if use_compiled:
+                model = load_compiled_forest(
+                    model_io.file_signature(os.path.join(compiled_dir, "meta.json")), compiled_dir
+                )
+            else:
+                model = batch_model
+            scaler = load_saved_artifact(model_io.file_signature(scaler_path), scaler_path)
+        st.sidebar.success(f"🎉 {model_name} loaded successfully!")
+        return model, scaler, batch_model
+    except Exception as e:
+        st.sidebar.error(f"Error loading files: {e}")
+        return None, None, None
 
 
 def load_files():
     st.sidebar.title("Upload Model Files")
+    model_source = st.sidebar.radio("Model source:", ["Upload Files", "Saved Models"])
+    if model_source == "Saved Models":
+        return load_saved_files()
+
     st.sidebar.markdown("🔄 **Upload the model and scaler files to get started.**")
     
     model_file = st.sidebar.file_uploader("Upload Model (.pkl)", type="pkl")
@@ -15,21 +88,21 @@ def load_files():
     if model_file and scaler_file:
         try:
             with st.spinner("Loading files..."):
-                model = joblib.load(model_file)
-                scaler = joblib.load(scaler_file)
+                model = load_uploaded_artifact(uploaded_digest(model_file), model_file.getvalue())
+                scaler = load_uploaded_artifact(uploaded_digest(scaler_file), scaler_file.getvalue())
             st.sidebar.success("🎉 Model and scaler loaded successfully!")
-            return model, scaler
+            return model, scaler, model
         except Exception as e:
             st.sidebar.error(f"Error loading files: {e}")
-            return None, None
+            return None, None, None
     else:
         st.sidebar.info("📥 Please upload both model and scaler files.")
-        return None, None
+        return None, None, None
 
 
 def predict_and_visualize(model, scaler, input_features):
     try:
-        st.info("🧠 **Processing your input...**")
+        start_time = time.perf_counter()
         input_array = [input_features]
 
         # Scale the inputs if a valid scaler is provided
@@ -38,28 +111,24 @@ def predict_and_visualize(model, scaler, input_features):
         else:
             input_scaled = input_array
 
-        # Simulate processing time for better user experience
-        with st.spinner("🔍 Making predictions..."):
-            time.sleep(1)
-            prediction = model.predict(input_scaled)
-
-        # Handle probabilities if available
-        if hasattr(model, "predict_proba"):
-            probabilities = model.predict_proba(input_scaled)[0]
-            class_labels = model.classes_
-        else:
-            probabilities = None
-            class_labels = None
+        # Single evaluation: the class is derived from the probabilities
+        prediction, probabilities = model_io.predict_with_proba(model, input_scaled)
+        class_labels = model.classes_ if probabilities is not None else None
+        latency_ms = (time.perf_counter() - start_time) * 1000
 
         # Display prediction results
-        st.success(f"✨ **Predicted Class:** `{prediction[0]}`")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.success(f"✨ **Predicted Class:** `{prediction[0]}`")
+        with col2:
+            st.metric("⏱️ Latency", f"{latency_ms:.1f} ms")
 
         # Display class probabilities (if available)
         if probabilities is not None and class_labels is not None:
             st.markdown("### Class Probabilities")
             prob_fig = px.bar(
                 x=class_labels,
-                y=probabilities,
+                y=probabilities[0],
                 labels={"x": "Class", "y": "Probability"},
                 title="Class Probabilities",
                 color_discrete_sequence=["#636EFA"],
@@ -70,20 +139,73 @@ def predict_and_visualize(model, scaler, input_features):
         st.error(f"Error during prediction: {e}")
 
 
+def batch_predict(model, scaler, feature_names):
+    st.header("Batch Scoring")
+    st.markdown("📦 Upload a CSV or Parquet file of feature rows to score them in chunks.")
+
+    batch_file = st.file_uploader("Upload Feature Rows", type=["csv", "parquet"])
+    if batch_file is None:
+        return
+
+    if st.button("📦 Score File"):
+        total_rows = None
+        if batch_file.name.lower().endswith(".csv"):
+            total_rows = max(batch_file.getvalue().count(b"\n") - 1, 1)
+
+        progress_bar = st.progress(0.0, text="Scoring rows...")
+
+        def update_progress(rows_scored):
+            if total_rows:
+                progress_bar.progress(min(rows_scored / total_rows, 1.0), text=f"Scored {rows_scored:,} rows")
+            else:
+                progress_bar.progress(0.0, text=f"Scored {rows_scored:,} rows")
+
+        # Replace the previous result file so old downloads do not pile up on disk
+        previous_output = st.session_state.pop("batch_output", None)
+        if previous_output and os.path.exists(previous_output["path"]):
+            os.remove(previous_output["path"])
+
+        output_file = tempfile.NamedTemporaryFile(suffix=".csv", delete=False)
+        output_file.close()
+        try:
+            batch_file.seek(0)
+            chunks = model_io.iter_feature_chunks(batch_file, batch_file.name)
+            start_time = time.perf_counter()
+            rows_scored = model_io.score_batches(
+                model, scaler, chunks, feature_names, output_file.name, progress=update_progress
+            )
+            elapsed = time.perf_counter() - start_time
+            progress_bar.progress(1.0, text=f"Scored {rows_scored:,} rows in {elapsed:.2f} s")
+            st.session_state["batch_output"] = {"path": output_file.name, "source": batch_file.name}
+        except Exception as e:
+            os.remove(output_file.name)
+            st.error(f"Error during batch scoring: {e}")
+
+    batch_output = st.session_state.get("batch_output")
+    if batch_output and os.path.exists(batch_output["path"]):
+        with open(batch_output["path"], "rb") as result_file:
+            st.download_button(
+                label="📥 Download Predictions (CSV)",
+                data=result_file,
+                file_name=f"{os.path.splitext(batch_output['source'])[0]}_predictions.csv",
+                mime="text/csv",
+            )
+
+
 def main():
     st.set_page_config(page_title="ML Model App", page_icon="🤖", layout="wide")
     st.title("🤖 ML Model Implementation")
 
     # Load model and scaler
-    model, scaler = load_files()
+    model, scaler, batch_model = load_files()
     if not model or not scaler:
         return
 
     # Organize the UI into tabs
-    tabs = st.tabs(["🎛️ Input Features", "📈 Prediction Results"])
+    tabs = st.tabs(["🎛️ Input Features", "📈 Prediction Results", "📦 Batch Scoring"])
     
     # Define feature names
-    feature_names = model.feature_names_in_ if hasattr(model, "feature_names_in_") else ["length (mm)", "width (mm)", "density (g/cm³)", "pH"]
+    feature_names = model_io.expected_feature_names(model, scaler) or ["length (mm)", "width (mm)", "density (g/cm³)", "pH"]
     input_features = []
 
     with tabs[0]:  # Input features tab
@@ -111,6 +233,9 @@ def main():
             predict_and_visualize(model, scaler, input_features)
             st.session_state["make_prediction"] = False
 
+    with tabs[2]:  # Batch scoring tab
+        batch_predict(batch_model, scaler, feature_names)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,145 @@
+import streamlit as st
+import generation
+import streaming
+
+
+# Redraw the chart every few batches; drawing every batch would dominate the loop
+CHART_EVERY_BATCHES = 5
+
+
+def parse_input(input_string):
+    return [item.strip() for item in input_string.split(",") if item.strip()]
+
+
+def class_params(features, classes, seed):
+    """
+    Returns (means, stds, correlations, distributions) for the stream.
+
+    Uses the class settings from the app page when they match these features,
+    and seeded defaults otherwise.
+    """
+    state = st.session_state
+    means, stds, correlations, feature_specs = {}, {}, {}, {}
+    for class_name in classes:
+        saved_means = state.get("mean_values_dict", {}).get(class_name)
+        saved_stds = state.get("std_values_dict", {}).get(class_name)
+        if saved_means is not None and len(saved_means) == len(features):
+            means[class_name], stds[class_name] = saved_means, saved_stds
+        else:
+            means[class_name], stds[class_name] = generation.default_class_params(class_name, len(features), seed)
+
+        correlation = state.get("correlation_dict", {}).get(class_name)
+        if correlation is not None and len(correlation) == len(features) and not generation.is_identity(correlation):
+            correlations[class_name] = correlation
+        specs = {
+            feature: spec for feature, spec in state.get("distribution_dict", {}).get(class_name, {}).items()
+            if feature in features
+        }
+        if specs:
+            feature_specs[class_name] = specs
+    return means, stds, correlations, feature_specs
+
+
+def stream_sidebar():
+    """Collects the stream settings from the sidebar."""
+    with st.sidebar:
+        st.header("🌊 Stream Settings")
+        features = parse_input(st.text_input(
+            "Enter feature names (comma-separated)", "length (mm), width (mm), density (g/cm³)"
+        ))
+        classes = parse_input(st.text_input("Enter class names (comma-separated)", "Ampalaya, Banana, Cabbage"))
+        seed = int(st.number_input("Random Seed", min_value=0, value=42, step=1))
+        batch_size = st.slider("Batch Size", min_value=50, max_value=5000, value=500, step=50)
+        n_batches = int(st.number_input("Number of Batches (0 = until stopped)", min_value=0, value=200, step=50))
+
+        st.subheader("📉 Drift")
+        mean_drift = st.number_input("Mean Drift per Batch (%)", value=0.0, step=0.1, format="%.2f") / 100
+        std_drift = st.number_input("Std Dev Drift per Batch (%)", value=0.0, step=0.1, format="%.2f") / 100
+        drift_start = int(st.number_input("Drift Starts at Batch", min_value=0, value=50, step=10))
+
+        st.subheader("🤖 Online Models")
+        model_names = st.multiselect(
+            "Models", list(streaming.make_online_models()), default=list(streaming.make_online_models())
+        )
+        show_cumulative = st.checkbox("Show Cumulative Accuracy", value=False)
+        history_points = st.slider(
+            "Chart Window (batches)", min_value=50, max_value=streaming.STREAM_HISTORY_POINTS,
+            value=streaming.STREAM_HISTORY_POINTS, step=50
+        )
+    return {
+        "features": features,
+        "classes": classes,
+        "seed": seed,
+        "batch_size": batch_size,
+        "n_batches": n_batches or None,
+        "mean_drift": mean_drift,
+        "std_drift": std_drift,
+        "drift_start": drift_start,
+        "model_names": model_names,
+        "show_cumulative": show_cumulative,
+        "history_points": history_points,
+    }
+
+
+def run_stream(settings):
+    """Streams batches through the online models, redrawing the accuracy chart as it goes."""
+    features, classes = settings["features"], settings["classes"]
+    means, stds, correlations, feature_specs = class_params(features, classes, settings["seed"])
+    models = {
+        model_name: model for model_name, model in streaming.make_online_models(settings["seed"]).items()
+        if model_name in settings["model_names"]
+    }
+    batches = streaming.stream_batches(
+        features, classes, means, stds,
+        batch_size=settings["batch_size"], seed=settings["seed"], n_batches=settings["n_batches"],
+        mean_drift=settings["mean_drift"], std_drift=settings["std_drift"], drift_start=settings["drift_start"],
+        correlation_dict=correlations, distribution_dict=feature_specs
+    )
+    columns = [
+        f"{model_name} (cumulative)" if settings["show_cumulative"] else model_name for model_name in models
+    ]
+
+    history = streaming.PrequentialHistory(settings["history_points"])
+    status = st.empty()
+    chart = st.empty()
+    for record in streaming.prequential(batches, models, classes):
+        history.append(record)
+        if history.batches % CHART_EVERY_BATCHES == 0 or history.batches == settings["n_batches"]:
+            latest = ", ".join(
+                f"{model_name}: {record[model_name]:.2%}" for model_name in models if record[model_name] is not None
+            )
+            status.write(f"Batch {record['batch'] + 1} · {history.batches * settings['batch_size']:,} rows · {latest}")
+            chart.line_chart(history.frame(columns), x_label="Batch", y_label="Accuracy")
+    st.success(f"Stream finished after {history.batches} batches.")
+
+
+def main():
+    st.title("🌊 Streaming Simulation")
+    st.write(
+        "Synthetic batches are drawn from the class settings (those on the app page when they match the features "
+        "below), optionally drifting over time. Each online model is scored on a batch before it learns from it "
+        "(prequential, test-then-train), and the chart keeps only the most recent batches, so the stream can run "
+        "indefinitely."
+    )
+
+    settings = stream_sidebar()
+    if len(settings["classes"]) < 2 or not settings["features"] or not settings["model_names"]:
+        st.info("Enter at least one feature, two classes and one model to start a stream.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start = st.button("▶️ Start Stream")
+    with col2:
+        # Any widget interaction reruns the page, which ends the running stream
+        st.button("⏹️ Stop Stream")
+
+    if start:
+        try:
+            run_stream(settings)
+        except ValueError as e:
+            st.error(f"Invalid class settings: {e}")
+
+
+if __name__ == "__main__":
+    main()
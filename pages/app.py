@@ -1,5 +1,4 @@
 import streamlit as st
-import random
 import time
 import os
 import io
@@ -7,22 +6,27 @@ import joblib
 import plotly.express as px
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier, ExtraTreesClassifier
-from sklearn.naive_bayes import GaussianNB
-from sklearn.svm import SVC
-from sklearn.neural_network import MLPClassifier
-from sklearn.metrics import classification_report
-from sklearn.model_selection import learning_curve
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report, confusion_matrix
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler 
-
+import pipeline
+import splits
+import profiling
+import session_memory
+import compute_scheduler
+import evaluation
+import jobs
+import experiment_log
+import dataset_store
+import rendering
+import generation
+import distributions
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+# How often a page waiting on a background job refreshes its progress
+JOB_POLL_INTERVAL_S = 0.5
+SAVED_MODELS_DIR = "saved_models"
 
 if "models" not in st.session_state:
     st.session_state["models"] = {}
@@ -81,8 +85,8 @@ def parse_input(input_string):
     """Parses a comma-separated input string into a list."""
     return [item.strip() for item in input_string.split(",")]
 
-def initialize_class_dicts(features, classes):
-    """Initializes or updates the mean and std dev dictionaries."""
+def initialize_class_dicts(features, classes, seed=0):
+    """Initializes or updates the mean and std dev dictionaries; new defaults are reproducible from the seed."""
     if "mean_values_dict" not in st.session_state:
         st.session_state.mean_values_dict = {}
     if "std_values_dict" not in st.session_state:
@@ -90,18 +94,19 @@ def initialize_class_dicts(features, classes):
 
     for class_name in classes:
         if class_name not in st.session_state.mean_values_dict:
-            st.session_state.mean_values_dict[class_name] = [random.uniform(50, 150) for _ in features]
-            st.session_state.std_values_dict[class_name] = [round(random.uniform(5.0, 15.0), 1) for _ in features]
+            means, stds = generation.default_class_params(class_name, len(features), seed)
+            st.session_state.mean_values_dict[class_name] = means
+            st.session_state.std_values_dict[class_name] = stds
         else:
-            adjust_feature_count(class_name, features)
+            adjust_feature_count(class_name, features, seed)
 
-def adjust_feature_count(class_name, features):
+def adjust_feature_count(class_name, features, seed=0):
     """Adjusts the feature count in existing dictionaries."""
     current_features = len(st.session_state.mean_values_dict[class_name])
     if current_features < len(features):
-        for _ in range(len(features) - current_features):
-            st.session_state.mean_values_dict[class_name].append(random.uniform(50, 150))
-            st.session_state.std_values_dict[class_name].append(round(random.uniform(5.0, 15.0), 1))
+        means, stds = generation.default_class_params(class_name, len(features), seed)
+        st.session_state.mean_values_dict[class_name].extend(means[current_features:])
+        st.session_state.std_values_dict[class_name].extend(stds[current_features:])
     elif current_features > len(features):
         st.session_state.mean_values_dict[class_name] = st.session_state.mean_values_dict[class_name][:len(features)]
         st.session_state.std_values_dict[class_name] = st.session_state.std_values_dict[class_name][:len(features)]
@@ -132,40 +137,109 @@ def configure_class_settings(features, classes):
                         key=f"std_{class_name}_{feature}"
                     ) for i, feature in enumerate(features)
                 ]
+            if len(features) > 1:
+                configure_correlation(class_name, features)
+            configure_distributions(class_name, features)
+
+def parse_numbers(input_string):
+    return [float(item) for item in parse_input(input_string) if item]
+
+def configure_distributions(class_name, features):
+    """Picks a registered distribution per feature; non-normal choices get their own parameter inputs."""
+    class_specs = st.session_state.setdefault("distribution_dict", {}).setdefault(class_name, {})
+    st.write("Feature Distributions (Normal uses the mean and std dev above):")
+    for feature in features:
+        previous = class_specs.get(feature, {})
+        names = list(distributions.DISTRIBUTIONS)
+        name = st.selectbox(
+            f"Distribution for {feature}",
+            names,
+            index=names.index(previous.get("type", distributions.NORMAL)),
+            format_func=lambda option: distributions.DISTRIBUTIONS[option].label,
+            key=f"dist_{class_name}_{feature}"
+        )
+        if name == distributions.NORMAL:
+            class_specs.pop(feature, None)
+            continue
+
+        distribution = distributions.get(name)
+        current = previous if previous.get("type") == name else {}
+        spec = {"type": name}
+        cols = st.columns(len(distribution.defaults))
+        try:
+            for col, (param, default) in zip(cols, distribution.defaults.items()):
+                value = current.get(param, default)
+                with col:
+                    if param in distribution.list_params:
+                        spec[param] = parse_numbers(st.text_input(
+                            f"{param} ({feature})", ", ".join(str(item) for item in value),
+                            key=f"dist_{class_name}_{feature}_{param}"
+                        ))
+                    else:
+                        spec[param] = st.number_input(
+                            f"{param} ({feature})", value=float(value), step=0.1,
+                            min_value=distribution.minimums.get(param),
+                            key=f"dist_{class_name}_{feature}_{param}"
+                        )
+            distributions.validate(spec)
+        except ValueError as e:
+            st.error(f"{class_name}, {feature}: {e}")
+            continue
+        class_specs[feature] = spec
+
+def configure_correlation(class_name, features):
+    """Edits a class's feature correlation matrix; only the upper triangle is read and mirrored."""
+    correlations = st.session_state.setdefault("correlation_dict", {})
+    current = generation.resize_correlation(correlations.get(class_name), len(features))
+    st.write("Feature Correlation (edit the upper triangle):")
+    edited = st.data_editor(
+        pd.DataFrame(current, index=features, columns=features),
+        key=f"corr_{class_name}_{'|'.join(features)}",
+    ).to_numpy(dtype=float)
+    upper = np.triu(edited, 1)
+    correlation = upper + upper.T + np.eye(len(features))
+    stds = st.session_state.std_values_dict[class_name]
+    try:
+        generation.cholesky_factor(stds, correlation)
+    except ValueError as e:
+        st.error(f"{class_name}: {e} Using the last valid matrix instead.")
+        try:
+            generation.cholesky_factor(stds, current)
+            correlation = current
+        except ValueError:
+            correlation = np.eye(len(features))
+    correlations[class_name] = correlation.tolist()
+
+@profiling.profiled("generate_synthetic_data")
+def generate_synthetic_data(features, classes, total_sample_size, seed):
+    """Generates synthetic data for each class; the same seed and settings give the same rows."""
+    return pipeline.generate_synthetic_data(
+        features, classes, total_sample_size,
+        st.session_state.mean_values_dict, st.session_state.std_values_dict, seed,
+        correlation_dict(features, classes), distribution_dict(features, classes)
+    )
 
-def generate_synthetic_data(features, classes, total_sample_size):
-    """Generates synthetic data for each class."""
-    samples_per_class = total_sample_size // len(classes)
-    remainder = total_sample_size % len(classes)
-    class_data = []
-
-    for i, class_name in enumerate(classes):
-            extra_sample = 1 if i < remainder else 0
-            num_samples = samples_per_class + extra_sample
-
-            mean_values = st.session_state.mean_values_dict[class_name]
-            std_values = st.session_state.std_values_dict[class_name]
-            data = np.random.normal(
-                loc=mean_values,
-                scale=std_values,
-                size=(num_samples, len(features))
-            )
-            class_labels = np.full((num_samples, 1), class_name)  # Class label column
-            class_data.append(np.hstack([data, class_labels]))
+def distribution_dict(features, classes):
+    """Returns the non-normal feature distributions set for these classes and features."""
+    specs = st.session_state.get("distribution_dict", {})
+    return {
+        class_name: {feature: spec for feature, spec in specs[class_name].items() if feature in features}
+        for class_name in classes if specs.get(class_name)
+    }
 
-    return class_data
+def correlation_dict(features, classes):
+    """Returns the non-identity correlation matrices set for these classes and features."""
+    correlations = st.session_state.get("correlation_dict", {})
+    return {
+        class_name: correlations[class_name] for class_name in classes
+        if len(correlations.get(class_name) or []) == len(features)
+        and not generation.is_identity(correlations[class_name])
+    }
 
-def handle_data_output(features, classes, class_data, total_sample_size, train_test_split_percent):
+@profiling.profiled("render_data_tables")
+def handle_data_output(features, class_df, scaled_df, total_sample_size, train_test_split_percent):
     """Handles data processing and output display."""
-    all_data = np.vstack(class_data)
-    np.random.shuffle(all_data)
-
     train_size = train_test_split_percent / 100
-    feature_data = all_data[:, :-1].astype(float)
-    labels = all_data[:, -1]
-
-    class_df = pd.DataFrame(feature_data, columns=features)
-    class_df['Target'] = labels
 
     train_samples = int(train_size * total_sample_size)
     test_samples = total_sample_size - train_samples
@@ -183,24 +257,20 @@ def handle_data_output(features, classes, class_data, total_sample_size, train_t
         st.markdown("Testing Samples")
         st.subheader(f"{train_samples} ({train_test_split_percent}%)")
 
-    scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(class_df[features])
-    scaled_df = pd.DataFrame(scaled_data, columns=features)
-    scaled_df['Target'] = labels
-
     st.subheader("📑 Generated Data Sample")
     col1, col2 = st.columns([4, 4])
     with col1:
         st.write("Original Data (Random samples from each class):")
         st.dataframe(class_df, use_container_width=True)
     with col2:
-        st.write("Scaled Data (using best model's scaler):")
+        st.write("Scaled Data (scaler fit on the training split):")
         st.dataframe(scaled_df, use_container_width=True)
 
 import streamlit as st
 import pandas as pd
 
-def sidebar_section():
+@profiling.profiled("sidebar")
+def sidebar_section(seed=0):
     """Handles the sidebar UI and input collection."""
     st.header("📂Data Source")
     data_source = st.radio("Choose data source:", ["Generate Synthetic Data", "Upload Dataset"])
@@ -216,7 +286,7 @@ def sidebar_section():
         features = parse_input(st.text_input("Enter feature names (comma-separated)", "length (mm), width (mm), density (g/cm³)"))
         classes = parse_input(st.text_input("Enter class names (comma-separated)", "Ampalaya, Banana, Cabbage"))
 
-        initialize_class_dicts(features, classes)
+        initialize_class_dicts(features, classes, seed)
         configure_class_settings(features, classes)
 
         col1, col2 = st.columns(2)
@@ -235,6 +305,20 @@ def sidebar_section():
         return data_source, None, None, None, None, uploaded_file
 
 
+def stored_dataset_selector():
+    """Lets the user reopen a previously generated dataset; returns its ID, or None for a new draw."""
+    datasets = {meta["dataset_id"]: meta for meta in dataset_store.list_datasets("generated")}
+    return st.selectbox(
+        "Stored Dataset",
+        [None] + list(datasets),
+        key="stored_dataset_id",
+        format_func=lambda dataset_id: "New random draw" if dataset_id is None else (
+            f"{dataset_id} · {datasets[dataset_id]['n_rows']} rows · "
+            f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(datasets[dataset_id]['created_at']))}"
+        ),
+    )
+
+
 def load_and_prepare_data(class_data):
     all_data = np.vstack(class_data)
     np.random.shuffle(all_data)
@@ -256,15 +340,17 @@ def plot_2d_scatter(df, x_feature, y_feature):
         x_feature: Feature name for the x-axis (exact name from the DataFrame).
         y_feature: Feature name for the y-axis (exact name from the DataFrame).
     """
-    fig = px.scatter(
-        df,
-        x=x_feature,
-        y=y_feature,
-        color="Target",
-        title=f"Scatter Plot of {x_feature} vs {y_feature}",
-        labels={x_feature: x_feature, y_feature: y_feature},  # Display exact feature names
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    with profiling.span("plotly_build"):
+        fig = px.scatter(
+            df,
+            x=x_feature,
+            y=y_feature,
+            color="Target",
+            title=f"Scatter Plot of {x_feature} vs {y_feature}",
+            labels={x_feature: x_feature, y_feature: y_feature},  # Display exact feature names
+        )
+    with profiling.span("plotly_render"):
+        st.plotly_chart(fig, use_container_width=True)
 
 
 def plot_3d_scatter(df, x_feature, y_feature, z_feature):
@@ -277,80 +363,120 @@ def plot_3d_scatter(df, x_feature, y_feature, z_feature):
         y_feature: Feature name for the y-axis (exact name from the DataFrame).
         z_feature: Feature name for the z-axis (exact name from the DataFrame).
     """
-    fig = px.scatter_3d(
-        df,
-        x=x_feature,
-        y=y_feature,
-        z=z_feature,
-        color="Target",
-        title=f"3D Scatter Plot of {x_feature}, {y_feature}, {z_feature}",
-        labels={
-            x_feature: x_feature,  
-            y_feature: y_feature,  
-            z_feature: z_feature   
-        },
+    with profiling.span("plotly_build"):
+        fig = px.scatter_3d(
+            df,
+            x=x_feature,
+            y=y_feature,
+            z=z_feature,
+            color="Target",
+            title=f"3D Scatter Plot of {x_feature}, {y_feature}, {z_feature}",
+            labels={
+                x_feature: x_feature,  
+                y_feature: y_feature,  
+                z_feature: z_feature   
+            },
+        )
+
+    with profiling.span("plotly_render"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def run_evaluation_job(job, split, seed):
+    """
+    Job body: runs the evaluation grid, reporting progress and stopping when cancelled.
+
+    Finished runs are saved to saved_models/ and appended to the experiment log
+    once, however many sessions share the job or rerun while showing it. The
+    fitted models are not kept in the job's result; pages load them from disk.
+    """
+    errors = []
+    timings = {}
+    start_time = time.perf_counter()
+    table, models = evaluation.evaluate_grid(
+        split, random_state=seed,
+        on_error=lambda model_name, message: errors.append((model_name, message)),
+        progress=lambda completed, total: job.report(completed / total, f"{completed}/{total} fits"),
+        # Leave INTERACTIVE_RESERVED_CORES free for generation and streaming in other reruns
+        n_workers=compute_scheduler.background_cores()
     )
+    timings["evaluate"] = round(time.perf_counter() - start_time, 4)
+    results = evaluation.holdout_results(table, split.y_test)
 
-    st.plotly_chart(fig, use_container_width=True)
+    job.report(1.0, "Saving models")
+    start_time = time.perf_counter()
+    pipeline.save_models(models, results, split.X_train, split.y_train, SAVED_MODELS_DIR, scaled=split.scale())
+    timings["save_models"] = round(time.perf_counter() - start_time, 4)
 
+    experiment_log.record_evaluation(
+        split, results, models, job.inputs.get("spec", {}),
+        source=job.inputs["source"], seed=seed, timings=timings
+    )
+    return table, errors
 
-def train_models(X_train, y_train, X_test, y_test):
-    models = {
-        "Gaussian Naive Bayes": GaussianNB(),
-        "AdaBoost Classifier": AdaBoostClassifier(algorithm='SAMME'),
-        "Random Forest Classifier": RandomForestClassifier(),
-        "Support Vector Classification": SVC(),
-        "Multi-layer Perceptron": MLPClassifier(max_iter=500),
-        "Extra Trees Classifier": ExtraTreesClassifier(),
-    }
 
-    results = {}
-    best_model = None
-    best_score = 0
+def submit_evaluation(split, seed, inputs):
+    """
+    Submits (or joins) the background evaluation of a split and records its ID in the URL.
+
+    Jobs are keyed by dataset fingerprint, seed and estimator config, so
+    identical experiments from any session share one run and its result.
+    """
+    key = ":".join([
+        pipeline.dataset_fingerprint(split.X_train, split.y_train),
+        pipeline.dataset_fingerprint(split.X_test, split.y_test),
+        str(seed),
+        pipeline.model_config(seed, split.n_train),
+    ])
+    job = jobs.get_runner().submit(run_evaluation_job, split, seed, label="evaluate_models", key=key, inputs=inputs)
+    st.query_params["job"] = job.job_id
+    return job
+
+
+def current_job(source):
+    """Returns the job named in the URL if it is still known and came from this data source."""
+    job_id = st.query_params.get("job")
+    job = jobs.get_runner().get(job_id) if job_id else None
+    if job is not None and job.inputs.get("source") == source:
+        return job
+    return None
+
+
+@profiling.profiled("evaluate_models")
+def wait_for_job(job):
+    """
+    Polls a job into a placeholder until it finishes; returns True if it succeeded.
 
-    for model_name, model in models.items():
-        start_time = time.time()
-        status = "Failed"
+    Reruns triggered while polling only stop this loop, never the job itself.
+    """
+    if st.button("⏹️ Cancel Training", disabled=job.done):
+        job.cancel()
 
-        try:
-            model.fit(X_train, y_train)
-            training_time = time.time() - start_time
-            y_pred = model.predict(X_test)
-
-            accuracy = accuracy_score(y_test, y_pred)
-            precision = precision_score(y_test, y_pred, average='weighted')
-            recall = recall_score(y_test, y_pred, average='weighted')
-            f1 = f1_score(y_test, y_pred, average='weighted')
-            status = "Success"
-
-            results[model_name] = {
-                "Accuracy": accuracy,
-                "Precision": precision,
-                "Recall": recall,
-                "F1-Score": f1,
-                "Training Time (s)": round(training_time, 4),
-                "Status": status,
-            }
-
-            if accuracy > best_score:
-                best_score = accuracy
-                best_model = model
-        except Exception as e:
-            results[model_name] = {
-                "Accuracy": None,
-                "Precision": None,
-                "Recall": None,
-                "F1-Score": None,
-                "Training Time (s)": None,
-                "Status": status,
-            }
-            st.error(f"Error training {model_name}: {e}")
-
-    return best_model, results, models
-
-
-def display_classification_report(best_model, X_test, y_test):
-    y_pred = best_model.predict(X_test)
+    placeholder = st.empty()
+    while not job.done:
+        placeholder.progress(job.progress, text=f"Job {job.job_id}: {job.message or job.status}")
+        job.wait(JOB_POLL_INTERVAL_S)
+    placeholder.empty()
+
+    if job.status == jobs.CANCELLED:
+        st.warning(f"Job {job.job_id} was cancelled. Press 'Generate Data and Train Model' to start again.")
+    elif job.status == jobs.FAILED:
+        st.error(f"Job {job.job_id} failed: {job.error}")
+    return job.status == jobs.DONE
+
+
+def job_results(job, y_test):
+    """Returns (best model name, results, evaluation table) from a finished evaluation job."""
+    table, errors = job.result
+    for model_name, error in errors:
+        st.error(f"Error training {model_name}: {error}")
+
+    results = evaluation.holdout_results(table, y_test)
+    return evaluation.best_model_name(results), results, table
+
+
+@profiling.profiled("classification_report")
+def display_classification_report(y_test, y_pred):
     report = classification_report(y_test, y_pred, output_dict=True)
     st.write("Classification Report (Best Model):")
     report_df = pd.DataFrame(report).transpose()
@@ -426,6 +552,7 @@ def display_metrics_chart(metric_df, metrics):
     st.plotly_chart(fig, use_container_width=True)
 
 # Main function to handle the performance metrics summary
+@profiling.profiled("performance_summary")
 def display_performance_summary(model_results):
     """
     Displays the performance metrics summary section.
@@ -454,6 +581,7 @@ def save_models(models, results, directory="saved_models"):
             joblib.dump(models[model_name], filepath)
     return directory
 
+@profiling.profiled("csv_export")
 def convert_df_to_csv(df):
      return df.to_csv(index=False).encode('utf-8')
 
@@ -465,43 +593,6 @@ def display_model_accuracy(results):
     )
     st.dataframe(model_accuracy_df)
 
-# Function to save models
-def save_models(models, results, X_train, y_train, saved_models_dir="saved_models"):
-    if not models or not results:
-        st.error("No models or results found to save.")
-        return
-
-    # Create directory for saving models
-    os.makedirs(saved_models_dir, exist_ok=True)
-    
-    for model_name, model in models.items():
-        model_accuracy = results.get(model_name, {}).get("Accuracy", "N/A")
-        
-        if model_accuracy != "N/A":
-            # Save original model
-            original_model_path = os.path.join(saved_models_dir, f"{model_name}.pkl")
-            joblib.dump(model, original_model_path)
-
-            # Create and save scaled model pipeline
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-
-               
-            scaler_file_path = os.path.join(saved_models_dir, f"{model_name}_scaler.pkl")
-            joblib.dump(scaler, scaler_file_path)
-
-                # Train the model with scaled data
-            model.fit(X_train_scaled, y_train)
-            scaled_model_file_path = os.path.join(saved_models_dir, f"{model_name}_scaled.pkl")
-            joblib.dump(model, scaled_model_file_path)
-
-        else:
-            print(f"Model {model_name} has no accuracy data.")
-    else:
-
-        # Save directory path to session state
-        st.session_state["saved_models"] = saved_models_dir
-        
 def display_download_button(saved_models_dir, model_accuracy_df):
     selected_model = st.selectbox("📥 Select Model to Download", options=model_accuracy_df["Model"])
 
@@ -517,108 +608,118 @@ def display_download_button(saved_models_dir, model_accuracy_df):
                 )
         else:
             st.error(f"Model file for {selected_model} not found!")
-# Function to plot the learning curve
-def plot_learning_curve(estimator, title, X, y, cv=None, train_sizes=np.linspace(0.1, 1.0, 5)):
-    plt.figure(figsize=(4, 4))
-    plt.title(title)
-    plt.xlabel("Training Examples")
-    plt.ylabel("Score")
-    
-    train_sizes, train_scores, test_scores = learning_curve(
-        estimator, X, y, cv=cv, train_sizes=train_sizes, scoring='accuracy', n_jobs=-1
-    )
-    
-    train_scores_mean = np.mean(train_scores, axis=1)
-    train_scores_std = np.std(train_scores, axis=1)
-    test_scores_mean = np.mean(test_scores, axis=1)
-    test_scores_std = np.std(test_scores, axis=1)
-    
-    plt.grid()
-    plt.fill_between(train_sizes, train_scores_mean - train_scores_std,
-                      train_scores_mean + train_scores_std, alpha=0.1, color="r")
-    plt.fill_between(train_sizes, test_scores_mean - test_scores_std,
-                      test_scores_mean + test_scores_std, alpha=0.1, color="g")
-    plt.plot(train_sizes, train_scores_mean, 'o-', color="r", label="Training score")
-    plt.plot(train_sizes, test_scores_mean, 'o-', color="g", label="Cross-validation score")
-    
-    plt.legend(loc="best")
-    return plt
+
 
 # Function to display learning curves
-def display_learning_curves(models, model_results, X_train, y_train):
+@profiling.profiled("learning_curves")
+def display_learning_curves(curves, model_results):
     st.subheader("📈 Learning Curves for All Models")
+    accuracies = {model_name: result.get("Accuracy") for model_name, result in model_results.items()}
+    # One figure for every model, rendered once per result set
+    with profiling.span("matplotlib_render"):
+        png = rendering.learning_curves_png(curves, accuracies)
+    st.image(png, width="stretch")
 
-    model_names = list(models.keys())
-    n_models = len(model_names)
-    cols_per_row = 4
-    rows = (n_models // cols_per_row) + (1 if n_models % cols_per_row else 0)
-
-    for row in range(rows):
-        cols = st.columns(cols_per_row)
-        for col_idx in range(cols_per_row):
-            model_idx = row * cols_per_row + col_idx
-            if model_idx < n_models:
-                model_name = model_names[model_idx]
-                model = models[model_name]
-                model_accuracy = model_results.get(model_name, {}).get("Accuracy", "N/A")
-
-                with cols[col_idx]:
-                    fig = plot_learning_curve(
-                        model,
-                        f"{model_name} \n Accuracy: {model_accuracy:.2%})",
-                        X_train,
-                        y_train,
-                        cv=5
-                    )
-                    st.pyplot(fig)
-
-
-def plot_confusion_matrix(model, X_test, y_test, model_name, class_names, model_accuracy):
-    y_pred = model.predict(X_test)
-    cm = confusion_matrix(y_test, y_pred)
-
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax,
-                xticklabels=class_names, yticklabels=class_names)
-    ax.set_title(f"{model_name} \n  Accuracy: {model_accuracy:.2%}")
-    ax.set_xlabel("Predicted")
-    ax.set_ylabel("Actual")
-    
-    return fig
 
 # Function to display confusion matrices
-def display_confusion_matrices(models, model_results, X_test, y_test):
+@profiling.profiled("confusion_matrices")
+def display_confusion_matrices(evaluation_table, model_results, y_test):
     st.subheader("Confusion Matrix for Each Model")
 
-    n_models = len(models)
-    rows = (n_models + 2) // 4
-    cols_per_row = 4
-    model_names = list(models.keys())
-
     class_names = sorted(y_test.unique())
-
-    for row in range(rows):
-        cols = st.columns(cols_per_row)
-        for col_idx in range(cols_per_row):
-            model_idx = row * cols_per_row + col_idx
-            if model_idx < n_models:
-                model_name = model_names[model_idx]
-                model = models[model_name]
-
-                # Fetch accuracy from model_results
-                model_accuracy = model_results.get(model_name, {}).get("Accuracy", "N/A")
-
-                with cols[col_idx]:
-                    if model_results.get(model_name, {}).get("Status") == "Success":
-                        fig = plot_confusion_matrix(
-                            model, X_test, y_test, model_name, class_names, model_accuracy
-                        )
-                        st.pyplot(fig)
-                    else:
-                        st.warning(f"{model_name} did not train successfully.")
+    with profiling.span("confusion_matrix_build"):
+        matrices = evaluation.confusion_matrices(evaluation_table, y_test, class_names)
+
+    for model_name in model_results:
+        if model_name not in matrices:
+            st.warning(f"{model_name} did not train successfully.")
+
+    if matrices:
+        accuracies = {model_name: result.get("Accuracy") for model_name, result in model_results.items()}
+        with profiling.span("matplotlib_render"):
+            png = rendering.confusion_matrices_png(matrices, class_names, accuracies)
+        st.image(png, width="stretch")
     
     
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def remember_run(job_id, results):
+    """Replaces the session's latest run with a finished job's, once per job; its models are on disk."""
+    if st.session_state.get("run_job_id") == job_id:
+        return
+    st.session_state["run_job_id"] = job_id
+    # The job keeps the results, so the session's copy can be evicted under memory pressure
+    session_memory.remember(st.session_state, "results", results)
+    st.session_state["saved_models"] = SAVED_MODELS_DIR
+
+
+def display_memory_panel():
+    """Enforces this session's memory budget and shows its usage and the total across sessions."""
+    usage = session_memory.session_usage(st.session_state)
+    evicted = session_memory.enforce_budget(st.session_state, usage=usage)
+    if evicted:
+        usage = session_memory.session_usage(st.session_state)
+    total_bytes = sum(usage.values())
+    session_id = current_session_id()
+    if session_id:
+        session_memory.report_usage(session_id, total_bytes)
+    budget_bytes = session_memory.SESSION_MEMORY_BUDGET_MB * 1024 * 1024
+
+    with st.sidebar.expander("🧠 Memory Usage"):
+        st.write(
+            f"This session: **{session_memory.format_bytes(total_bytes)}** "
+            f"of {session_memory.format_bytes(budget_bytes)} budget"
+        )
+        st.progress(min(total_bytes / budget_bytes, 1.0))
+        if evicted:
+            st.caption(f"Evicted to stay within budget: {', '.join(evicted)}")
+        if total_bytes > budget_bytes:
+            st.warning("This session is over its memory budget, and nothing evictable is left.")
+        largest = sorted(usage.items(), key=lambda item: item[1], reverse=True)[:8]
+        st.dataframe(
+            pd.DataFrame(
+                [(key, session_memory.format_bytes(size)) for key, size in largest],
+                columns=["Key", "Size"],
+            ),
+            hide_index=True,
+        )
+        all_sessions_bytes, session_count = session_memory.global_usage()
+        st.write(f"All sessions: **{session_memory.format_bytes(all_sessions_bytes)}** across {session_count} sessions")
+
+
+def display_compute_panel():
+    """Shows the shared CPU budget: cores in use, queued requests and running stages."""
+    stats = compute_scheduler.stats()
+    with st.sidebar.expander("🖥️ Compute Budget"):
+        st.write(f"Cores in use: **{stats['in_use']} / {stats['total_cores']}**")
+        st.progress(min(stats["utilization"], 1.0))
+        col1, col2 = st.columns(2)
+        col1.metric("Queue Depth", stats["queue_depth"])
+        col2.metric("Mean Wait", f"{stats['mean_wait_s']:.2f} s")
+        if stats["running"]:
+            st.dataframe(pd.DataFrame(stats["running"], columns=["Stage", "Cores"]), hide_index=True)
+        job_counts = jobs.get_runner().stats()
+        st.write(f"Background jobs: {job_counts[jobs.RUNNING]} running, {job_counts[jobs.QUEUED]} queued")
+
+
+def display_profile_panel(profiler):
+    """Shows the current rerun's stage breakdown and a Chrome trace export in the sidebar."""
+    with st.sidebar.expander("⏱️ Stage Timings"):
+        st.write(f"Rerun total: **{profiler.elapsed() * 1000:.0f} ms**")
+        st.dataframe(pd.DataFrame(profiler.summary()), hide_index=True)
+        st.download_button(
+            label="📥 Download Trace (Chrome JSON)",
+            data=profiler.to_chrome_trace(),
+            file_name="app_trace.json",
+            mime="application/json",
+        )
+
+
 def main():
+    profiler = profiling.start_run("app")
       
     st.title("🤖 ML Model Generator 🤖")
    
@@ -631,219 +732,294 @@ def main():
 
     with st.sidebar:
         
-        data_source, features, classes, total_sample_size, train_test_split_percent, uploaded_file = sidebar_section()
+        # Seeds data generation, default class settings, splits and models
+        seed = int(st.number_input("Random Seed", min_value=0, value=42, step=1))
+
+        data_source, features, classes, total_sample_size, train_test_split_percent, uploaded_file = sidebar_section(seed)
+        stored_dataset_id = stored_dataset_selector() if data_source == "Generate Synthetic Data" else None
 
         generate_data_button = st.button("Generate Data and Train Model")
 
 
 
     if data_source == "Generate Synthetic Data":
-        class_data = generate_synthetic_data(features, classes, total_sample_size)
-        if generate_data_button or 'generated':
-            handle_data_output(features, classes, class_data, total_sample_size, train_test_split_percent)
-            
-            all_data = np.vstack(class_data)
-            np.random.shuffle(all_data)
-            feature_data = all_data[:, :-1].astype(float)
-            labels = all_data[:, -1]
+        # While a job is in the URL, show the data it trains on; widget changes apply on the next button press
+        job = current_job("generated")
+        if generate_data_button or job is None:
+            if stored_dataset_id:
+                # Reopen the exact rows of an earlier run; the sidebar's generation settings are not used
+                with profiling.span("load_dataset"):
+                    class_df, dataset_meta = dataset_store.load_frame(stored_dataset_id)
+                features, classes = dataset_meta["features"], dataset_meta["classes"]
+                total_sample_size = dataset_meta["n_rows"]
+                dataset_spec = dataset_meta["spec"]
+                dataset_id = stored_dataset_id
+            else:
+                class_data = generate_synthetic_data(features, classes, total_sample_size, seed)
+                # Create DataFrame for class data
+                with profiling.span("build_dataframe"):
+                    class_df = pipeline.build_dataframe(class_data, features)
+                correlations = correlation_dict(features, classes)
+                feature_specs = distribution_dict(features, classes)
+                dataset_spec = {
+                    "features": features,
+                    "classes": {
+                        class_name: {
+                            "mean": st.session_state.mean_values_dict[class_name],
+                            "std": st.session_state.std_values_dict[class_name],
+                            **({"correlation": correlations[class_name]} if class_name in correlations else {}),
+                            **({"distributions": feature_specs[class_name]} if feature_specs.get(class_name) else {}),
+                        } for class_name in classes
+                    },
+                    "total_sample_size": total_sample_size,
+                    "seed": seed,
+                }
+                with profiling.span("store_dataset"):
+                    dataset_id = dataset_store.save_frame(class_df, features, dataset_spec)
 
-            
+            # Split data
+            with profiling.span("split"):
+                split = splits.DatasetSplit(
+                    class_df[features], class_df["Target"],
+                    test_size=(100 - train_test_split_percent) / 100, random_state=seed
+                )
 
-            # Create DataFrame for class data
-            class_df = pd.DataFrame(feature_data, columns=features)
-            class_df['Target'] = labels
-
-            scaler = StandardScaler()
-            scaled_data = scaler.fit_transform(class_df[features]) 
-            scaled_df = pd.DataFrame(scaled_data, columns=features)
-            scaled_df['Target'] = labels  
-
-            st.subheader("📊 Feature Visualization")
-            features = class_df.columns[:-1]  # Exclude 'Target' for plotting
-
-            # Convert all features to numeric, coercing errors
-            for feature in features:
-                class_df[feature] = pd.to_numeric(class_df[feature], errors='coerce')
-
-            # List of unique class labels
-            classes = class_df['Target'].unique()
-
-            features = list(features) if isinstance(features, pd.Index) else features
-
-            # Initialize session state for features
-            if "x_feature" not in st.session_state:
-                st.session_state.x_feature = features[0]
-            if "y_feature" not in st.session_state:
-                st.session_state.y_feature = features[1] if len(features) > 1 else features[0]
-            if "z_feature" not in st.session_state:
-                st.session_state.z_feature = features[2] if len(features) > 2 else features[0]
-
-            # Select visualization type
-            visualization_type = st.radio("📈Select Visualization Type📈", ["2D", "3D"])
-
-            if visualization_type == "2D":
-                # Dropdowns for X and Y axes
-                col1, col2 = st.columns(2)
-                with col1:
-                    x_feature = st.selectbox(
-                        "Select X-Axis Feature",
-                        features,
-                        index=features.index(st.session_state.x_feature) if st.session_state.x_feature in features else 0,
-                        key="x_feature_select"
-                    )
-                with col2:
-                    y_feature = st.selectbox(
-                        "Select Y-Axis Feature",
-                        features,
-                        index=features.index(st.session_state.y_feature) if st.session_state.y_feature in features else 0,
-                        key="y_feature_select"
-                    )
-                plot_2d_scatter(class_df, x_feature, y_feature)
-
-
-            elif visualization_type == "3D":
-                # Dropdowns for X, Y, and Z axes
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    x_feature = st.selectbox(
-                        "Select X-Axis Feature",
-                        features,
-                        index=features.index(st.session_state.x_feature) if st.session_state.x_feature in features else 0,
-                        key="x_3d"
-                    )
-                with col2:
-                    y_feature = st.selectbox(
-                        "Select Y-Axis Feature",
-                        features,
-                        index=features.index(st.session_state.y_feature) if st.session_state.y_feature in features else 0,
-                        key="y_3d"
-                    )
-                with col3:
-                    z_feature = st.selectbox(
-                        "Select Z-Axis Feature",
-                        features,
-                        index=features.index(st.session_state.z_feature) if st.session_state.z_feature in features else 0,
-                        key="z_3d"
-                    )
-                plot_3d_scatter(class_df, x_feature, y_feature, z_feature)
+            job = submit_evaluation(split, seed, {
+                "source": "generated",
+                "features": features,
+                "classes": classes,
+                "total_sample_size": total_sample_size,
+                "train_test_split_percent": train_test_split_percent,
+                "spec": {
+                    **dataset_spec,
+                    "dataset_id": dataset_id,
+                    "test_size": (100 - train_test_split_percent) / 100,
+                    "seed": seed,
+                },
+            })
+        else:
+            # Jobs keep only their spec: reopen the stored rows (memory-mapped) and redraw the same split
+            features = job.inputs["features"]
+            classes = job.inputs["classes"]
+            total_sample_size = job.inputs["total_sample_size"]
+            train_test_split_percent = job.inputs["train_test_split_percent"]
+            job_spec = job.inputs["spec"]
+            dataset_id = job_spec["dataset_id"]
+            with profiling.span("load_dataset"):
+                class_df, _ = dataset_store.load_frame(dataset_id)
+            with profiling.span("split"):
+                split = splits.DatasetSplit(
+                    class_df[features], class_df["Target"],
+                    test_size=job_spec["test_size"], random_state=job_spec["seed"]
+                )
+        labels = class_df['Target']
+        X_train, X_test, y_train, y_test = split.astuple()
 
-            
-            # Split data
-            #train_test_split_percent = st.slider("Train/Test Split (%)", 10, 90, 80)
-            X = class_df[features]
-            y = class_df["Target"]
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=(100 - train_test_split_percent) / 100)
-            
-            st.subheader("📥 Download Dataset")
+        with profiling.span("scale"):
+            scaled_df = split.scaled_frame()
+            scaled_df['Target'] = labels
+
+        st.caption(f"Dataset ID: {dataset_id} (reopen it from 'Stored Dataset' in the sidebar)")
+        handle_data_output(features, class_df, scaled_df, total_sample_size, train_test_split_percent)
+
+        st.subheader("📊 Feature Visualization")
+        features = class_df.columns[:-1]  # Exclude 'Target' for plotting
 
-            original_csv = convert_df_to_csv(class_df)
-            scaled_csv = convert_df_to_csv(scaled_df)
+        # Convert all features to numeric, coercing errors
+        for feature in features:
+            class_df[feature] = pd.to_numeric(class_df[feature], errors='coerce')
 
-            # Create download buttons
+        # List of unique class labels
+        classes = class_df['Target'].unique()
+
+        features = list(features) if isinstance(features, pd.Index) else features
+
+        # Initialize session state for features
+        if "x_feature" not in st.session_state:
+            st.session_state.x_feature = features[0]
+        if "y_feature" not in st.session_state:
+            st.session_state.y_feature = features[1] if len(features) > 1 else features[0]
+        if "z_feature" not in st.session_state:
+            st.session_state.z_feature = features[2] if len(features) > 2 else features[0]
+
+        # Select visualization type
+        visualization_type = st.radio("📈Select Visualization Type📈", ["2D", "3D"])
+
+        if visualization_type == "2D":
+            # Dropdowns for X and Y axes
             col1, col2 = st.columns(2)
             with col1:
-                st.download_button(
-                    label="📥 Original Dataset (CSV)",
-                    data=original_csv,
-                    file_name="original_dataset.csv",
-                    mime="text/csv"
+                x_feature = st.selectbox(
+                    "Select X-Axis Feature",
+                    features,
+                    index=features.index(st.session_state.x_feature) if st.session_state.x_feature in features else 0,
+                    key="x_feature_select"
                 )
             with col2:
-                st.download_button(
-                    label="📥 Scaled Dataset (CSV)",
-                    data=scaled_csv,
-                    file_name="scaled_dataset.csv",
-                    mime="text/csv"
+                y_feature = st.selectbox(
+                    "Select Y-Axis Feature",
+                    features,
+                    index=features.index(st.session_state.y_feature) if st.session_state.y_feature in features else 0,
+                    key="y_feature_select"
                 )
+            plot_2d_scatter(class_df, x_feature, y_feature)
 
-            
-            with st.expander("Dataset Statistics"):
-                st.subheader("♨️ Dataset Statistics Overview")
 
-                col1, col2 = st.columns(2)
+        elif visualization_type == "3D":
+            # Dropdowns for X, Y, and Z axes
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                x_feature = st.selectbox(
+                    "Select X-Axis Feature",
+                    features,
+                    index=features.index(st.session_state.x_feature) if st.session_state.x_feature in features else 0,
+                    key="x_3d"
+                )
+            with col2:
+                y_feature = st.selectbox(
+                    "Select Y-Axis Feature",
+                    features,
+                    index=features.index(st.session_state.y_feature) if st.session_state.y_feature in features else 0,
+                    key="y_3d"
+                )
+            with col3:
+                z_feature = st.selectbox(
+                    "Select Z-Axis Feature",
+                    features,
+                    index=features.index(st.session_state.z_feature) if st.session_state.z_feature in features else 0,
+                    key="z_3d"
+                )
+            plot_3d_scatter(class_df, x_feature, y_feature, z_feature)
 
-                with col1:
-                    st.write("**Original Dataset**")
-                    st.dataframe(class_df.describe())
-                with col2:
-                    st.write("**Scaled Dataset**")
-                    st.dataframe(scaled_df.describe())
-                    
+        
+        st.subheader("📥 Download Dataset")
 
-            # Train models
-            best_model, results, models = train_models(X_train, y_train, X_test, y_test)
+        original_csv = convert_df_to_csv(class_df)
+        scaled_csv = convert_df_to_csv(scaled_df)
 
-            # Display results
-            
-            if best_model:
-                display_best_model_and_results(results)
-                
-                display_classification_report(best_model, X_test, y_test)
-                display_model_comparison(results)
-                display_performance_summary(results)
+        # Create download buttons
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Original Dataset (CSV)",
+                data=original_csv,
+                file_name="original_dataset.csv",
+                mime="text/csv"
+            )
+        with col2:
+            st.download_button(
+                label="📥 Scaled Dataset (CSV)",
+                data=scaled_csv,
+                file_name="scaled_dataset.csv",
+                mime="text/csv"
+            )
 
-                st.subheader("💾 Saved Models and Accuracy")
-                display_model_accuracy(results)
-    
-                saved_models_dir = "saved_models"
-                save_models(models, results, X_train, y_train)
+        
+        with st.expander("Dataset Statistics"), profiling.span("dataset_statistics"):
+            st.subheader("♨️ Dataset Statistics Overview")
 
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.write("**Original Dataset**")
+                st.dataframe(class_df.describe())
+            with col2:
+                st.write("**Scaled Dataset**")
+                st.dataframe(scaled_df.describe())
                 
 
-                model_accuracy_df = pd.DataFrame(
-                    [(model_name, results['Accuracy']) for model_name, results in results.items()],
-                    columns=["Model", "Accuracy"]
-                )
+        # Train models in the background
+        best_model_name, results, evaluation_table = None, {}, None
+        if wait_for_job(job):
+            best_model_name, results, evaluation_table = job_results(job, y_test)
+            remember_run(job.job_id, results)
 
+        # Display results
+        
+        if best_model_name:
+            display_best_model_and_results(results)
             
-                # Streamlit UI for selecting a model to download
-                selected_model = st.selectbox(
-                        "📥 Select Model to Download", 
-                        options=model_accuracy_df["Model"]
-                        )
+            display_classification_report(
+                y_test, evaluation.holdout_predictions(evaluation_table, best_model_name)
+            )
+            display_model_comparison(results)
+            display_performance_summary(results)
 
-                if selected_model:
-                            # Define file paths for both the original model and the scaled model
-                    original_model_path = os.path.join(saved_models_dir, f"{selected_model}.pkl")
-                    scaled_model_path = os.path.join(saved_models_dir, f"{selected_model}_scaled.pkl")
+            st.subheader("💾 Saved Models and Accuracy")
+            display_model_accuracy(results)
 
-                            # Step 3: Allow download of the original model
-                    if os.path.exists(original_model_path):
-                        with open(original_model_path, "rb") as original_file:
-                            st.download_button(
-                                label=f"Download {selected_model} (Original Model) (.pkl)",
-                                data=original_file,
-                                file_name=f"{selected_model}.pkl",
-                                mime="application/octet-stream",
-                            )
-                    else:
-                        st.error(f"Original model file for {selected_model} not found!")
+            # The job saved the models when it finished
+            saved_models_dir = SAVED_MODELS_DIR
 
-                            # Step 4: Allow download of the scaled model (pipeline including scaler)
-                    if os.path.exists(scaled_model_path):
-                        with open(scaled_model_path, "rb") as scaled_file:
-                            st.download_button(
-                                label=f"Download {selected_model} (Scaled Model with Scaler) (.pkl)",
-                                data=scaled_file,
-                                file_name=f"{selected_model}_scaled.pkl",
-                                mime="application/octet-stream",
-                            )
-                    else:
-                        st.error(f"Scaled model file for {selected_model} not found!")
+            
 
+            model_accuracy_df = pd.DataFrame(
+                [(model_name, results['Accuracy']) for model_name, results in results.items()],
+                columns=["Model", "Accuracy"]
+            )
 
-                display_learning_curves(models, results, X_train, y_train)
-                
-                display_confusion_matrices(models, results, X_test, y_test) 
+        
+            # Streamlit UI for selecting a model to download
+            selected_model = st.selectbox(
+                    "📥 Select Model to Download", 
+                    options=model_accuracy_df["Model"]
+                    )
+
+            if selected_model:
+                        # Define file paths for both the original model and the scaled model
+                original_model_path = os.path.join(saved_models_dir, f"{selected_model}.pkl")
+                scaled_model_path = os.path.join(saved_models_dir, f"{selected_model}_scaled.pkl")
+
+                        # Step 3: Allow download of the original model
+                if os.path.exists(original_model_path):
+                    with open(original_model_path, "rb") as original_file:
+                        st.download_button(
+                            label=f"Download {selected_model} (Original Model) (.pkl)",
+                            data=original_file,
+                            file_name=f"{selected_model}.pkl",
+                            mime="application/octet-stream",
+                        )
+                else:
+                    st.error(f"Original model file for {selected_model} not found!")
+
+                        # Step 4: Allow download of the scaled model (pipeline including scaler)
+                if os.path.exists(scaled_model_path):
+                    with open(scaled_model_path, "rb") as scaled_file:
+                        st.download_button(
+                            label=f"Download {selected_model} (Scaled Model with Scaler) (.pkl)",
+                            data=scaled_file,
+                            file_name=f"{selected_model}_scaled.pkl",
+                            mime="application/octet-stream",
+                        )
+                else:
+                    st.error(f"Scaled model file for {selected_model} not found!")
+
+
+            display_learning_curves(evaluation.learning_curves(evaluation_table), results)
+            
+            display_confusion_matrices(evaluation_table, results, y_test)
+            
+               
                 
-                   
-                    
     elif data_source == "Upload Dataset":
-        if uploaded_file is not None:
+        # While an upload job is in the URL, show the data it trains on; a new file applies on the next button press
+        job = current_job("upload")
+        reattach = job is not None and (uploaded_file is None or not generate_data_button)
+        if uploaded_file is not None or reattach:
             try:
-                # Read and validate the uploaded file
-                raw_file_content = uploaded_file.getvalue().decode("utf-8")
-                class_df = pd.read_csv(io.StringIO(raw_file_content))
+                if reattach:
+                    # Jobs keep only their spec: reopen the stored rows (memory-mapped) and redraw the same split
+                    job_spec = job.inputs["spec"]
+                    with profiling.span("load_dataset"):
+                        class_df, _ = dataset_store.load_frame(job_spec["dataset_id"])
+                    test_size, split_seed = job_spec["test_size"], job_spec["seed"]
+                else:
+                    # Read and validate the uploaded file
+                    with profiling.span("read_upload"):
+                        raw_file_content = uploaded_file.getvalue().decode("utf-8")
+                        class_df = pd.read_csv(io.StringIO(raw_file_content))
+                    train_test_split_percent = 80
+                    test_size, split_seed = (100 - train_test_split_percent) / 100, seed
 
                 # Validate the dataset structure
                 if 'Target' not in class_df.columns:
@@ -853,29 +1029,17 @@ def main():
                     class_df['Target'] = class_df['Target'].astype(str)  # Ensure 'Target' is categorical
 
                     st.sidebar.subheader("📂 Dataset Information")
+                    if reattach:
+                        st.sidebar.write(f"File: {job_spec['file_name']}")
                     st.sidebar.write(f"Shape: {class_df.shape}")
                     st.sidebar.write(f"Columns: {list(class_df.columns)}")
 
-                    # Feature Scaling
-                    scaler = StandardScaler()
-                    X_scaled = scaler.fit_transform(class_df[features])
-
-                    # Convert scaled data back into DataFrame
-                    scaled_df = pd.DataFrame(X_scaled, columns=features)
-
-                    # Add the 'Target' column back to the scaled data
-                    scaled_df['Target'] = class_df['Target']
-
-                    # Create two columns for the original and scaled datasets
-                    col1, col2 = st.columns(2)
-
                     # Train/Test split
-                    train_test_split_percent = 80
-                    X = class_df[features]
-                    y = class_df["Target"]
-                    X_train, X_test, y_train, y_test = train_test_split(
-                        X, y, test_size=(100 - train_test_split_percent) / 100
+                    split = splits.DatasetSplit(
+                        class_df[features], class_df["Target"],
+                        test_size=test_size, random_state=split_seed
                     )
+                    X_train, X_test, y_train, y_test = split.astuple()
 
                     # Dataset Split Information
                     st.subheader("🔀 Dataset Split Information")
@@ -907,14 +1071,8 @@ def main():
                         st.subheader("Original Dataset")
                         st.dataframe(class_df)
 
-                    # Feature Scaling
-                    scaler = StandardScaler()
-                    X_scaled = scaler.fit_transform(class_df[features])
-
-                    # Convert scaled data back into DataFrame
-                    scaled_df = pd.DataFrame(X_scaled, columns=features)
-
-                    # Add the 'Target' column back to the scaled data
+                    # Feature Scaling (scaler fit on the training split only)
+                    scaled_df = split.scaled_frame()
                     scaled_df['Target'] = class_df['Target']
 
                     # Display the scaled dataset in the second column
@@ -1038,24 +1196,44 @@ def main():
                                 st.write("Scaled Dataset Target Distribution:")
                                 st.write(scaled_df['Target'].value_counts())
 
-                    # Train models
-                    best_model, results, models = train_models(X_train, y_train, X_test, y_test)
+                    # Train models in the background; uploading the same file again rejoins the same job
+                    if not reattach:
+                        with profiling.span("store_dataset"):
+                            dataset_id = dataset_store.save_frame(
+                                class_df, features, {"file_name": uploaded_file.name}, source="upload"
+                            )
+                        job = submit_evaluation(split, seed, {
+                            "source": "upload",
+                            "spec": {
+                                "dataset_id": dataset_id,
+                                "file_name": uploaded_file.name,
+                                "file_bytes": uploaded_file.size,
+                                "features": features,
+                                "test_size": test_size,
+                                "seed": seed,
+                            },
+                        })
+                    best_model_name, results, evaluation_table = None, {}, None
+                    if wait_for_job(job):
+                        best_model_name, results, evaluation_table = job_results(job, y_test)
+                        remember_run(job.job_id, results)
 
                     # Display results
-                    if best_model:
+                    if best_model_name:
                         display_best_model_and_results(results)
-                        display_classification_report(best_model, X_test, y_test)
+                        display_classification_report(
+                            y_test, evaluation.holdout_predictions(evaluation_table, best_model_name)
+                        )
                         display_model_comparison(results)
                         display_performance_summary(results)
 
-                        # Save models using the existing save_models function
-                        saved_models_dir = "saved_models"  # Ensure this directory is defined
-                        save_models(models, results, X_train, y_train)  # Correctly call the function
+                        # The job saved the models when it finished
+                        saved_models_dir = SAVED_MODELS_DIR
 
                         # Display Saved Models Table with Accuracy
                         model_accuracy_data = {
-                            "Model": list(models.keys()),
-                            "Accuracy": [results.get(model_name, {}).get("Accuracy", "N/A") for model_name in models.keys()]
+                            "Model": list(results.keys()),
+                            "Accuracy": [results.get(model_name, {}).get("Accuracy", "N/A") for model_name in results.keys()]
                         }
                         model_accuracy_df = pd.DataFrame(model_accuracy_data)
 
@@ -1102,14 +1280,18 @@ def main():
                         
 
                         # Display Learning Curves
-                        display_learning_curves(models, results, X_train, y_train)
+                        display_learning_curves(evaluation.learning_curves(evaluation_table), results)
 
                         # Display Confusion Matrices
-                        display_confusion_matrices(models, results, X_test, y_test)
+                        display_confusion_matrices(evaluation_table, results, y_test)
 
             except Exception as e:
                 st.error(f"Error processing the uploaded file: {e}")
 
+    display_memory_panel()
+    display_compute_panel()
+    display_profile_panel(profiler)
+
 
 
 
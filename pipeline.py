@@ -0,0 +1,368 @@
+"""
+UI-free generate -> train -> evaluate pipeline.
+
+The Streamlit app calls these functions for its synthetic data and model
+training, and the same pipeline can be run headless from a spec file:
+
+    python pipeline.py spec.json --output-dir runs/nightly
+
+Spec format (JSON, or YAML when PyYAML is installed):
+
+    {
+        "features": ["length (mm)", "width (mm)", "density (g/cm³)"],
+        "classes": {
+            "Ampalaya": {"mean": [100, 80, 1.2], "std": [10, 8, 0.1]},
+            "Banana": {
+                "mean": [120, 40, 0.9], "std": [12, 5, 0.1],
+                "correlation": [[1, 0.6, 0], [0.6, 1, 0], [0, 0, 1]],
+                "distributions": {"density (g/cm³)": {"type": "uniform", "low": 0.8, "high": 1.0}}
+            }
+        },
+        "total_sample_size": 5000,
+        "test_size": 0.2,
+        "seed": 42,
+        "large_threshold": 20000,
+        "learning_curves": true
+    }
+
+A class's optional "correlation" matrix correlates its normal features; without
+one they are drawn independently. Its optional "distributions" map selects
+another registered distribution for some features (see distributions.py).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import hashlib
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier, ExtraTreesClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.svm import SVC, LinearSVC
+from sklearn.kernel_approximation import Nystroem
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler, FunctionTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.base import clone
+
+import model_io
+import forest_compiler
+import generation
+import distributions
+import splits
+
+
+LEARNING_CURVE_SIZES = np.linspace(0.1, 1.0, 5)
+
+# Candidates that are trained on standardized features
+SCALE_SENSITIVE_MODELS = ("Support Vector Classification", "Multi-layer Perceptron")
+
+# Above this many training rows, kernel SVC and the MLP are swapped for scalable variants
+LARGE_DATASET_ROWS = int(os.environ.get("LARGE_DATASET_ROWS", 20_000))
+NYSTROEM_COMPONENTS = 300
+
+
+def generate_synthetic_data(features, classes, total_sample_size, mean_values_dict, std_values_dict, seed=None,
+                            correlation_dict=None, distribution_dict=None):
+    """Generates rows for each class; returns shuffled (X, y). See generation.generate."""
+    return generation.generate(
+        features, classes, total_sample_size, mean_values_dict, std_values_dict, seed,
+        correlation_dict=correlation_dict, distribution_dict=distribution_dict
+    )
+
+
+def build_dataframe(class_data, features):
+    """Wraps generated (X, y) in a DataFrame with a Target column, without copying X."""
+    X, y = class_data
+    class_df = pd.DataFrame(X, columns=features, copy=False)
+    class_df['Target'] = y
+    return class_df
+
+
+def model_variants(n_rows=None, large_threshold=LARGE_DATASET_ROWS):
+    """Returns {model name: variant label} for candidates substituted at this training-set size."""
+    if n_rows is None or n_rows <= large_threshold:
+        return {}
+    return {
+        "Support Vector Classification": f"Nystroem ({NYSTROEM_COMPONENTS}) + LinearSVC",
+        "Multi-layer Perceptron": "Early stopping",
+    }
+
+
+def make_models(random_state=None, n_rows=None, large_threshold=LARGE_DATASET_ROWS):
+    """
+    Returns the candidate estimators, keyed by display name.
+
+    When n_rows exceeds large_threshold, the kernel SVC is replaced by a Nystroem
+    kernel approximation feeding a linear SVM, and the MLP stops early on a
+    validation split; see model_variants for the labels.
+    """
+    variants = model_variants(n_rows, large_threshold)
+    if "Support Vector Classification" not in variants:
+        svc = SVC()
+    else:
+        svc = Pipeline([
+            ("nystroem", Nystroem(n_components=NYSTROEM_COMPONENTS)),
+            ("svm", LinearSVC(dual="auto")),
+        ])
+    models = {
+        "Gaussian Naive Bayes": GaussianNB(),
+        "AdaBoost Classifier": AdaBoostClassifier(algorithm='SAMME'),
+        "Random Forest Classifier": RandomForestClassifier(),
+        "Support Vector Classification": svc,
+        "Multi-layer Perceptron": MLPClassifier(
+            max_iter=500, early_stopping="Multi-layer Perceptron" in variants
+        ),
+        "Extra Trees Classifier": ExtraTreesClassifier(),
+    }
+    if random_state is not None:
+        for model in models.values():
+            # Pipelines expose nested seeds as <step>__random_state
+            seeds = {key: random_state for key in model.get_params() if key.split("__")[-1] == "random_state"}
+            model.set_params(**seeds)
+    return models
+
+
+def dataset_fingerprint(X, y=None):
+    """Returns a content hash of a feature matrix (and labels), independent of pandas indexes."""
+    digest = hashlib.sha256()
+    if isinstance(X, pd.DataFrame):
+        digest.update(repr(list(X.columns)).encode("utf-8"))
+    digest.update(np.ascontiguousarray(np.asarray(X, dtype=np.float64)).tobytes())
+    if y is not None:
+        # UTF-8 so non-ASCII labels hash too; ASCII labels hash exactly as before
+        digest.update(np.char.encode(np.asarray(y).astype(str), "utf-8").tobytes())
+    return digest.hexdigest()
+
+
+def model_config(random_state=None, n_rows=None, large_threshold=LARGE_DATASET_ROWS):
+    """Returns a hash of the candidate estimators' parameters for cache keys."""
+    params = {
+        name: model.get_params(deep=True)
+        for name, model in make_models(random_state, n_rows, large_threshold).items()
+    }
+    return hashlib.sha256(repr(sorted(params.items())).encode("utf-8")).hexdigest()
+
+
+def scale_features(X_train, X_test=None):
+    """Fits a StandardScaler on the training rows; returns (scaler, X_train_scaled, X_test_scaled) as float32."""
+    scaler = StandardScaler().fit(X_train)
+    X_test_scaled = None if X_test is None else scaler.transform(X_test).astype(np.float32)
+    return scaler, scaler.transform(X_train).astype(np.float32), X_test_scaled
+
+
+def make_scaled_pipeline(scaler, model):
+    """
+    Wraps a model trained on scaled float32 features so it accepts raw features.
+
+    Both steps may already be fitted; the pipeline then predicts exactly like
+    the model did on the cached scaled arrays.
+    """
+    to_float32 = FunctionTransformer(np.asarray, kw_args={"dtype": np.float32})
+    return Pipeline([("scaler", scaler), ("float32", to_float32), ("model", model)])
+
+
+def save_models(models, results, X_train, y_train, saved_models_dir="saved_models", scaled=None):
+    """
+    Writes each successfully trained model plus a scaled copy and its scaler to a directory.
+
+    Files per model: <name>.pkl, <name>_scaler.pkl, <name>_scaled.pkl and, for
+    forests, a compiled <name>_scaled_compiled/ directory. Every model shares
+    the one train-only scaler (pass DatasetSplit.scale() to reuse it).
+    """
+    os.makedirs(saved_models_dir, exist_ok=True)
+    if scaled is None:
+        scaled = scale_features(X_train)
+    scaler, X_train_scaled, _ = scaled
+
+    for model_name, model in models.items():
+        # Failed candidates are unfitted clones; refitting them would only fail again
+        if results.get(model_name, {}).get("Status") == "Success":
+            # Save original model
+            original_model_path = os.path.join(saved_models_dir, f"{model_name}.pkl")
+            model_io.dump_artifact(model, original_model_path)
+
+            scaler_file_path = os.path.join(saved_models_dir, f"{model_name}_scaler.pkl")
+            model_io.dump_artifact(scaler, scaler_file_path)
+
+            if isinstance(model, Pipeline):
+                # Already trained on the scaled arrays
+                scaled_model = model.named_steps["model"]
+            else:
+                # Train a copy on scaled data so the evaluated model is left untouched
+                scaled_model = clone(model).fit(X_train_scaled, y_train)
+            scaled_model_file_path = os.path.join(saved_models_dir, f"{model_name}_scaled.pkl")
+            model_io.dump_artifact(scaled_model, scaled_model_file_path)
+
+            # Export forests to the compiled array format for fast loading and scoring
+            if forest_compiler.is_compilable(scaled_model):
+                forest_compiler.export_forest(scaled_model, forest_compiler.compiled_path(scaled_model_file_path))
+
+        else:
+            print(f"Model {model_name} did not train successfully; not saved.")
+
+    return saved_models_dir
+
+
+def load_spec(path):
+    """Reads a pipeline spec from a JSON or YAML file."""
+    with open(path) as spec_file:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML specs require PyYAML (pip install pyyaml).")
+            spec = yaml.safe_load(spec_file)
+        else:
+            spec = json.load(spec_file)
+
+    if spec.get("dataset_id"):
+        # The stored dataset replaces the generation settings
+        return spec
+    for key in ("features", "classes", "total_sample_size"):
+        if key not in spec:
+            raise ValueError(f"Spec is missing required key: {key}")
+    for class_name, params in spec["classes"].items():
+        if len(params["mean"]) != len(spec["features"]) or len(params["std"]) != len(spec["features"]):
+            raise ValueError(f"Class {class_name} needs one mean and one std per feature.")
+        if "correlation" in params:
+            try:
+                generation.cholesky_factor(params["std"], params["correlation"])
+            except ValueError as e:
+                raise ValueError(f"Class {class_name}: {e}")
+        for feature, feature_spec in params.get("distributions", {}).items():
+            if feature not in spec["features"]:
+                raise ValueError(f"Class {class_name} sets a distribution for unknown feature {feature!r}.")
+            try:
+                distributions.validate(feature_spec)
+            except ValueError as e:
+                raise ValueError(f"Class {class_name}, feature {feature}: {e}")
+    return spec
+
+
+def _to_builtin(value):
+    """Converts numpy values so metrics can be written as JSON."""
+    if isinstance(value, dict):
+        return {str(key): _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_builtin(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def run_pipeline(spec, output_dir, record=True):
+    """
+    Runs generation, training, evaluation and export for one spec.
+
+    Writes dataset.csv, evaluation.csv (one row per fit), metrics.json,
+    timings.json and a models/ directory to output_dir and returns the metrics
+    dict. The generated data is kept in the dataset store; a spec with a
+    "dataset_id" reuses that stored dataset instead of generating new rows.
+    Unless record is False the run is also appended to the experiment log.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timings = {}
+
+    def timed(stage, func, *args, **kwargs):
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings[stage] = round(time.perf_counter() - start_time, 4)
+        return result
+
+    # Imported here because these modules build on this one
+    import dataset_store
+    import evaluation
+    import experiment_log
+
+    if spec.get("dataset_id"):
+        # Rerun on the exact rows of a stored dataset instead of a new draw
+        class_df, dataset_meta = timed("load_dataset", dataset_store.load_frame, spec["dataset_id"])
+        features = dataset_meta["features"]
+        dataset_id = spec["dataset_id"]
+    else:
+        features = spec["features"]
+        classes = list(spec["classes"])
+        mean_values_dict = {name: params["mean"] for name, params in spec["classes"].items()}
+        std_values_dict = {name: params["std"] for name, params in spec["classes"].items()}
+        correlation_dict = {
+            name: params["correlation"] for name, params in spec["classes"].items() if "correlation" in params
+        }
+        distribution_dict = {
+            name: params["distributions"] for name, params in spec["classes"].items() if "distributions" in params
+        }
+
+        class_data = timed(
+            "generate", generate_synthetic_data,
+            features, classes, spec["total_sample_size"], mean_values_dict, std_values_dict, spec.get("seed"),
+            correlation_dict, distribution_dict
+        )
+        class_df = timed("build_dataframe", build_dataframe, class_data, features)
+        dataset_id = timed("store_dataset", dataset_store.save_frame, class_df, features, spec, "pipeline")
+    timed("export_dataset", class_df.to_csv, os.path.join(output_dir, "dataset.csv"), index=False)
+
+    split = timed(
+        "split", splits.DatasetSplit, class_df[features], class_df["Target"],
+        test_size=spec.get("test_size", 0.2), random_state=spec.get("seed")
+    )
+    X_train, X_test, y_train, y_test = split.astuple()
+    scaled = timed("scale", split.scale)
+
+    errors = {}
+    table, models = timed(
+        "evaluate", evaluation.evaluate_grid, split, random_state=spec.get("seed"),
+        train_sizes=LEARNING_CURVE_SIZES if spec.get("learning_curves", True) else [],
+        large_threshold=spec.get("large_threshold", LARGE_DATASET_ROWS),
+        on_error=lambda model_name, message: errors.__setitem__(model_name, message)
+    )
+    results = evaluation.holdout_results(table, y_test)
+    learning_curves = evaluation.learning_curves(table)
+    timed(
+        "export_evaluation", table.drop(columns=["Predictions"]).to_csv,
+        os.path.join(output_dir, "evaluation.csv"), index=False
+    )
+
+    timed(
+        "save_models", save_models, models, results, X_train, y_train, os.path.join(output_dir, "models"),
+        scaled=scaled
+    )
+
+    metrics = {
+        "dataset_id": dataset_id, "results": results, "errors": errors, "learning_curves": learning_curves
+    }
+    with open(os.path.join(output_dir, "metrics.json"), "w") as metrics_file:
+        json.dump(_to_builtin(metrics), metrics_file, indent=2)
+    with open(os.path.join(output_dir, "timings.json"), "w") as timings_file:
+        json.dump(timings, timings_file, indent=2)
+    if record:
+        experiment_log.record_evaluation(
+            split, results, models, {**spec, "dataset_id": dataset_id}, source="pipeline", seed=spec.get("seed"),
+            timings=timings
+        )
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic data, train and evaluate all models.")
+    parser.add_argument("spec", help="Path to a JSON or YAML spec file.")
+    parser.add_argument("--output-dir", default="pipeline_output")
+    parser.add_argument("--no-learning-curves", action="store_true")
+    parser.add_argument("--no-log", action="store_true", help="Do not append this run to the experiment log.")
+    args = parser.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    if args.no_learning_curves:
+        spec["learning_curves"] = False
+    metrics = run_pipeline(spec, args.output_dir, record=not args.no_log)
+
+    for model_name, result in metrics["results"].items():
+        accuracy = result["Accuracy"]
+        print(f"{model_name}: {'failed' if accuracy is None else f'{accuracy:.4f}'}")
+    print(f"Dataset {metrics['dataset_id']}; results written to {args.output_dir}")
+    return 0 if not metrics["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Lightweight span-based profiler for the app pipeline.
+
+A Profiler is started once per rerun; stages are recorded with the span()
+context manager or the profiled() decorator and can be summarized or exported
+in Chrome trace format (load the JSON in chrome://tracing or Perfetto).
+"""
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+
+_current_profiler = contextvars.ContextVar("profiler", default=None)
+_current_depth = contextvars.ContextVar("profiler_depth", default=0)
+
+
+class Profiler:
+    """Collects timed spans for one run of the pipeline."""
+
+    def __init__(self, name="rerun"):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def record(self, name, start, duration, depth):
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "start_s": start - self.origin,
+                "duration_s": duration,
+                "depth": depth,
+                "thread_id": threading.get_ident(),
+            })
+
+    def elapsed(self):
+        return time.perf_counter() - self.origin
+
+    def summary(self):
+        """Returns per-stage call counts and total time, slowest first."""
+        totals = {}
+        for span_record in self.spans:
+            entry = totals.setdefault(span_record["name"], {"Stage": span_record["name"], "Calls": 0, "Total (ms)": 0.0})
+            entry["Calls"] += 1
+            entry["Total (ms)"] += span_record["duration_s"] * 1000
+        elapsed_ms = self.elapsed() * 1000
+        for entry in totals.values():
+            entry["Total (ms)"] = round(entry["Total (ms)"], 2)
+            entry["Share of Rerun (%)"] = round(100 * entry["Total (ms)"] / elapsed_ms, 1) if elapsed_ms else 0.0
+        return sorted(totals.values(), key=lambda entry: entry["Total (ms)"], reverse=True)
+
+    def to_chrome_trace(self):
+        """Returns the spans as a Chrome trace JSON string."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span_record["name"],
+                "cat": self.name,
+                "ph": "X",
+                "ts": round(span_record["start_s"] * 1e6, 3),
+                "dur": round(span_record["duration_s"] * 1e6, 3),
+                "pid": pid,
+                "tid": span_record["thread_id"],
+                "args": {"depth": span_record["depth"]},
+            }
+            for span_record in self.spans
+        ]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+def start_run(name="rerun"):
+    """Starts a new profiler for the current context and returns it."""
+    profiler = Profiler(name)
+    _current_profiler.set(profiler)
+    return profiler
+
+
+def current():
+    """Returns the active profiler, or None if none was started."""
+    return _current_profiler.get()
+
+
+@contextmanager
+def span(name):
+    """Times the enclosed block as a stage of the active profiler (no-op without one)."""
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+
+    depth = _current_depth.get()
+    token = _current_depth.set(depth + 1)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record(name, start, time.perf_counter() - start, depth)
+        _current_depth.reset(token)
+
+
+def profiled(name=None):
+    """Decorator that records each call of a function as a span."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,189 @@
+"""
+Leak-free, cached matplotlib rendering for the model comparison views.
+
+Every model is drawn into one multi-panel figure per view, rendered to PNG
+bytes once. The figure is then closed, and pages display the PNG with
+st.image. Figures are built with matplotlib.figure.Figure, never pyplot, so they
+are not registered in pyplot's global figure list and cannot pile up in a
+long-lived server process.
+
+Rendered images are kept in a small process-wide LRU keyed by a hash of the
+data being plotted (arrays, titles and labels). A rerun, or another session
+showing the same results, reuses the PNG instead of drawing it again.
+"""
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import seaborn as sns
+from matplotlib.figure import Figure
+
+
+RENDER_CACHE_ENTRIES = int(os.environ.get("RENDER_CACHE_ENTRIES", 64))
+PANELS_PER_ROW = 4
+PANEL_SIZE = (4, 3.5)
+DPI = 100
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _digest(*parts):
+    """Hashes nested lists/tuples/dicts of arrays, numbers and strings."""
+    digest = hashlib.sha256()
+
+    def update(part):
+        if isinstance(part, dict):
+            for key in sorted(part, key=str):
+                digest.update(repr(key).encode("utf-8"))
+                update(part[key])
+        elif isinstance(part, (list, tuple)):
+            digest.update(b"[")
+            for item in part:
+                update(item)
+            digest.update(b"]")
+        elif isinstance(part, np.ndarray):
+            digest.update(repr((part.dtype.str, part.shape)).encode("utf-8"))
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode("utf-8"))
+
+    for part in parts:
+        update(part)
+    return digest.hexdigest()
+
+
+def _cached(kind, key_parts, draw):
+    """Returns the PNG for key_parts, calling draw() to render it on a miss."""
+    key = (kind, _digest(*key_parts))
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    png = draw()
+    with _cache_lock:
+        _cache[key] = png
+        while len(_cache) > RENDER_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return png
+
+
+def _grid(n_panels, panels_per_row=PANELS_PER_ROW):
+    """Returns (figure, flat list of axes) sized for n_panels, hiding unused axes."""
+    n_cols = max(1, min(panels_per_row, n_panels))
+    n_rows = max(1, -(-n_panels // n_cols))
+    fig = Figure(figsize=(PANEL_SIZE[0] * n_cols, PANEL_SIZE[1] * n_rows), dpi=DPI)
+    axes = fig.subplots(n_rows, n_cols, squeeze=False).ravel()
+    for ax in axes[n_panels:]:
+        ax.set_visible(False)
+    return fig, list(axes[:n_panels])
+
+
+def _to_png(fig):
+    buffer = io.BytesIO()
+    try:
+        # Fixed margins (in inches) instead of tight_layout, which costs as much as drawing the panels
+        width, height = fig.get_size_inches()
+        fig.subplots_adjust(
+            left=0.9 / width, right=1 - 0.2 / width, bottom=0.7 / height, top=1 - 0.6 / height,
+            hspace=0.6, wspace=0.45
+        )
+        fig.savefig(buffer, format="png")
+    finally:
+        # Drop the canvas and artists now rather than waiting for the garbage collector
+        fig.clear()
+    return buffer.getvalue()
+
+
+def format_accuracy(accuracy):
+    return "N/A" if accuracy is None else f"{accuracy:.2%}"
+
+
+def _titles(panels, accuracies):
+    if accuracies is None:
+        return {name: name for name in panels}
+    return {name: f"{name}\nAccuracy: {format_accuracy(accuracies.get(name))}" for name in panels}
+
+
+def _draw_learning_curve(ax, curve, title):
+    train_sizes = curve["train_sizes"]
+    train_mean, train_std = curve["train_scores_mean"], curve["train_scores_std"]
+    test_mean, test_std = curve["test_scores_mean"], curve["test_scores_std"]
+    ax.set_title(title, fontsize=10)
+    ax.set_xlabel("Training Examples")
+    ax.set_ylabel("Score")
+    ax.grid()
+    ax.fill_between(train_sizes, train_mean - train_std, train_mean + train_std, alpha=0.1, color="r")
+    ax.fill_between(train_sizes, test_mean - test_std, test_mean + test_std, alpha=0.1, color="g")
+    ax.plot(train_sizes, train_mean, 'o-', color="r", label="Training score")
+    ax.plot(train_sizes, test_mean, 'o-', color="g", label="Cross-validation score")
+    ax.legend(loc="best", fontsize=8)
+
+
+def _draw_confusion_matrix(ax, cm, class_names, title):
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax, cbar=False,
+                xticklabels=class_names, yticklabels=class_names)
+    ax.set_title(title, fontsize=10)
+    ax.set_xlabel("Predicted")
+    ax.set_ylabel("Actual")
+
+
+def learning_curves_png(curves, accuracies=None, panels_per_row=PANELS_PER_ROW):
+    """
+    Renders every model's learning curve into one grid; returns PNG bytes.
+
+    Args:
+        curves: {model name: learning-curve dict} as returned by
+            evaluation.learning_curves.
+        accuracies: Optional {model name: holdout accuracy} shown in the
+            panel titles.
+    """
+    titles = _titles(curves, accuracies)
+
+    def draw():
+        fig, axes = _grid(len(curves), panels_per_row)
+        for ax, (model_name, curve) in zip(axes, curves.items()):
+            _draw_learning_curve(ax, curve, titles[model_name])
+        return _to_png(fig)
+
+    return _cached("learning_curves", (curves, titles, panels_per_row), draw)
+
+
+def confusion_matrices_png(matrices, class_names, accuracies=None, panels_per_row=PANELS_PER_ROW):
+    """Renders every model's confusion matrix into one grid; returns PNG bytes."""
+    class_names = [str(name) for name in class_names]
+    titles = _titles(matrices, accuracies)
+
+    def draw():
+        fig, axes = _grid(len(matrices), panels_per_row)
+        for ax, (model_name, cm) in zip(axes, matrices.items()):
+            _draw_confusion_matrix(ax, cm, class_names, titles[model_name])
+        return _to_png(fig)
+
+    return _cached("confusion_matrices", (matrices, class_names, titles, panels_per_row), draw)
+
+
+def confusion_matrix_png(cm, class_names, title="Confusion Matrix"):
+    """Renders a single confusion matrix; returns PNG bytes."""
+    return confusion_matrices_png({title: np.asarray(cm)}, class_names, panels_per_row=1)
+
+
+def learning_curve_png(curve, title="Learning Curve"):
+    """Renders a single learning curve; missing std arrays are drawn as zero bands."""
+    zeros = np.zeros(len(curve["train_sizes"]))
+    curve = {
+        "train_sizes": np.asarray(curve["train_sizes"]),
+        "train_scores_mean": np.asarray(curve["train_scores_mean"]),
+        "train_scores_std": np.asarray(curve.get("train_scores_std", zeros)),
+        "test_scores_mean": np.asarray(curve["test_scores_mean"]),
+        "test_scores_std": np.asarray(curve.get("test_scores_std", zeros)),
+    }
+    return learning_curves_png({title: curve}, panels_per_row=1)
+
+
+def cache_info():
+    with _cache_lock:
+        return {"entries": len(_cache), "bytes": sum(len(png) for png in _cache.values())}
@@ -0,0 +1,138 @@
+"""
+Approximate memory accounting for Streamlit session state.
+
+Values that can be recomputed or reloaded (a run's results, hash caches) are
+stored with remember(), which marks them evictable and tracks when they were
+last used. Each rerun measures the session's state, and enforce_budget() drops
+evictable keys, least recently used first, until the session fits
+SESSION_MEMORY_BUDGET_MB. User settings and widget state are never evicted.
+Trained models are not kept in session state at all: the job that trained
+them saves them to disk.
+
+Per-session totals are also reported to a process-wide registry so operators
+can see the total across all sessions.
+"""
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+SESSION_MEMORY_BUDGET_MB = float(os.environ.get("SESSION_MEMORY_BUDGET_MB", 512))
+# Sessions that have not reported for this long are assumed closed
+SESSION_REPORT_TTL_S = 30 * 60
+# Session state key holding {evictable key: last used time}, least recently used first
+EVICTABLE_KEY = "evictable_keys"
+
+_registry_lock = threading.Lock()
+_session_usage = {}
+
+
+def estimate_size(obj, _seen=None):
+    """
+    Returns an approximate deep size of obj in bytes.
+
+    numpy arrays and pandas objects are measured by their buffers, fitted
+    sklearn trees through their pickled state, and containers and plain
+    objects recursively. Objects reachable more than once are counted once;
+    memory-mapped arrays count as zero because their pages are shared.
+    """
+    if _seen is None:
+        _seen = {}
+    if id(obj) in _seen:
+        return 0
+    # Keep a reference so temporaries (e.g. tree state dicts) cannot be freed and their ids reused
+    _seen[id(obj)] = obj
+
+    if isinstance(obj, np.memmap):
+        return 0
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return obj.nbytes + sum(estimate_size(item, _seen) for item in obj.ravel())
+        if isinstance(obj.base, np.ndarray):
+            # Views share their base's buffer
+            return estimate_size(obj.base, _seen)
+        return obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            estimate_size(key, _seen) + estimate_size(value, _seen) for key, value in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(item, _seen) for item in obj)
+    if type(obj).__module__.startswith("sklearn.tree") and hasattr(obj, "__getstate__"):
+        # Cython Tree objects hide their node arrays; the pickled state exposes them
+        return sys.getsizeof(obj) + estimate_size(obj.__getstate__(), _seen)
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + estimate_size(vars(obj), _seen)
+    return sys.getsizeof(obj)
+
+
+def format_bytes(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024 or unit == "GB":
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def session_usage(session_state):
+    """Measures every session state key, counting shared objects once. Returns a dict of key -> bytes."""
+    seen = {}
+    return {key: estimate_size(session_state[key], seen) for key in list(session_state.keys())}
+
+
+def touch(session_state, key):
+    """Marks an evictable key as just used."""
+    last_used = session_state.setdefault(EVICTABLE_KEY, OrderedDict())
+    last_used.pop(key, None)
+    last_used[key] = time.time()
+
+
+def remember(session_state, key, value):
+    """Stores a value that may be evicted when the session is over its budget."""
+    session_state[key] = value
+    touch(session_state, key)
+
+
+def enforce_budget(session_state, budget_mb=None, usage=None):
+    """
+    Evicts evictable keys, least recently used first, until the session fits its budget.
+
+    Pass usage from session_usage() to avoid measuring twice. Returns the
+    evicted keys.
+    """
+    budget_bytes = (budget_mb if budget_mb is not None else SESSION_MEMORY_BUDGET_MB) * 1024 * 1024
+    usage = usage if usage is not None else session_usage(session_state)
+    total_bytes = sum(usage.values())
+    last_used = session_state.get(EVICTABLE_KEY, OrderedDict())
+    evicted = []
+    while last_used and total_bytes > budget_bytes:
+        key, _ = last_used.popitem(last=False)
+        if key in session_state:
+            total_bytes -= usage.get(key, 0)
+            del session_state[key]
+            evicted.append(key)
+    return evicted
+
+
+def report_usage(session_id, total_bytes):
+    """Publishes a session's total to the process-wide registry."""
+    with _registry_lock:
+        _session_usage[session_id] = {"bytes": total_bytes, "reported_at": time.time()}
+
+
+def global_usage():
+    """Returns (total bytes, session count) across sessions that reported recently."""
+    cutoff = time.time() - SESSION_REPORT_TTL_S
+    with _registry_lock:
+        for session_id in [key for key, entry in _session_usage.items() if entry["reported_at"] < cutoff]:
+            del _session_usage[session_id]
+        return sum(entry["bytes"] for entry in _session_usage.values()), len(_session_usage)
@@ -0,0 +1,118 @@
+"""
+Stratified train/test and cross-validation splits computed once per dataset.
+
+A DatasetSplit draws the train/test indices and the K-fold indices of the
+training rows a single time. Rows are reordered once so the training rows come
+first, which lets the train and test sets be handed out as slices of one frame
+instead of separate copies. Every model, learning curve and confusion matrix
+built from the same DatasetSplit therefore sees identical rows and folds.
+
+The split also owns the dataset's only StandardScaler, fit on the training rows
+and applied once to produce the float32 scaled arrays used by scale-sensitive
+models and by the scaled data views.
+"""
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from sklearn.model_selection import StratifiedShuffleSplit, ShuffleSplit, StratifiedKFold, KFold
+
+
+CV_FOLDS = 5
+
+
+def _min_class_count(y):
+    _, counts = np.unique(y, return_counts=True)
+    return counts.min() if len(counts) else 0
+
+
+def split_indices(y, test_size=0.2, random_state=None):
+    """
+    Returns (train indices, test indices), stratified by y when every class has enough rows.
+
+    Falls back to a plain shuffled split for tiny classes that cannot be stratified.
+    Indices stay in shuffled order: learning curves train on prefixes of the
+    training rows, and on class-sorted data a sorted prefix holds a single class.
+    """
+    y = np.asarray(y)
+    placeholder = np.zeros(len(y))
+    try:
+        splitter = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+        train_idx, test_idx = next(splitter.split(placeholder, y))
+    except ValueError:
+        splitter = ShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+        train_idx, test_idx = next(splitter.split(placeholder))
+    return train_idx, test_idx
+
+
+def fold_indices(y, n_splits=CV_FOLDS, random_state=None):
+    """Returns a list of (train indices, validation indices) pairs for K-fold cross-validation."""
+    y = np.asarray(y)
+    placeholder = np.zeros(len(y))
+    if _min_class_count(y) >= n_splits:
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        return list(splitter.split(placeholder, y))
+    splitter = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(splitter.split(placeholder))
+
+
+def _take(data, index):
+    return data.iloc[index] if hasattr(data, "iloc") else np.asarray(data)[index]
+
+
+def _head(data, stop):
+    return data.iloc[:stop] if hasattr(data, "iloc") else data[:stop]
+
+
+def _tail(data, start):
+    return data.iloc[start:] if hasattr(data, "iloc") else data[start:]
+
+
+class DatasetSplit:
+    """
+    Train/test split and cross-validation folds for one dataset.
+
+    Attributes:
+        X_train, X_test, y_train, y_test: Slices of the reordered data.
+        train_index, test_index: Row positions in the original data.
+        folds: (train, validation) position pairs relative to the training
+            rows; pass as cv= to sklearn model selection helpers.
+    """
+
+    def __init__(self, X, y, test_size=0.2, n_splits=CV_FOLDS, random_state=None):
+        y_values = np.asarray(y)
+        self.train_index, self.test_index = split_indices(y_values, test_size, random_state)
+        n_train = len(self.train_index)
+
+        order = np.concatenate([self.train_index, self.test_index])
+        self._restore_order = np.argsort(order)
+        self.n_train = n_train
+        self.X = _take(X, order)
+        self.y = _take(y, order)
+        self.X_train, self.X_test = _head(self.X, n_train), _tail(self.X, n_train)
+        self.y_train, self.y_test = _head(self.y, n_train), _tail(self.y, n_train)
+
+        self.folds = fold_indices(y_values[self.train_index], n_splits, random_state)
+
+        self.scaler = None
+        self.X_scaled = None
+
+    def scale(self):
+        """
+        Fits the scaler on the training rows (once) and returns (scaler, X_train_scaled, X_test_scaled).
+
+        The scaled arrays are float32 slices of one cached array.
+        """
+        if self.scaler is None:
+            self.scaler = StandardScaler().fit(self.X_train)
+            self.X_scaled = self.scaler.transform(self.X).astype(np.float32)
+        return self.scaler, self.X_scaled[:self.n_train], self.X_scaled[self.n_train:]
+
+    def scaled_frame(self):
+        """Returns every row scaled with the training scaler, in the original row order."""
+        self.scale()
+        columns = self.X.columns if hasattr(self.X, "columns") else None
+        return pd.DataFrame(self.X_scaled[self._restore_order], columns=columns)
+
+    def astuple(self):
+        """Returns (X_train, X_test, y_train, y_test) in train_test_split order."""
+        return self.X_train, self.X_test, self.y_train, self.y_test
@@ -0,0 +1,142 @@
+"""
+Streaming simulation: drifting synthetic batches scored by online learners.
+
+stream_batches() yields an unbounded (or fixed-length) sequence of batches drawn
+from the per-class parameters. Class means and stds optionally drift linearly
+with the batch index. Batch t is seeded from (seed, t), so any batch can be
+reproduced without replaying the ones before it.
+
+prequential() consumes batches with incremental learners (partial_fit) in
+test-then-train order. Each model predicts a batch before it learns from it, so
+every score is on unseen data. Only the current batch, the models and running
+totals are held, so memory stays flat however long the stream runs. Callers
+keep a bounded history for charts (see PrequentialHistory).
+"""
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from sklearn.naive_bayes import GaussianNB
+from sklearn.linear_model import SGDClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+import generation
+
+
+STREAM_HISTORY_POINTS = 500
+# Models whose inputs are standardized with a running scaler
+SCALE_SENSITIVE_ONLINE_MODELS = ("SGD Classifier", "Multi-layer Perceptron")
+
+
+def drifted_params(mean_values_dict, std_values_dict, batch_index, mean_drift=0.0, std_drift=0.0, drift_start=0):
+    """
+    Returns (means, stds) at a batch index.
+
+    Means and stds grow by mean_drift and std_drift (fractions of their starting
+    values) per batch after drift_start; stds never fall below 1% of the start.
+    """
+    steps = max(0, batch_index - drift_start)
+    means = {
+        class_name: (np.asarray(values, dtype=np.float64) * (1 + mean_drift * steps)).tolist()
+        for class_name, values in mean_values_dict.items()
+    }
+    stds = {
+        class_name: (np.asarray(values, dtype=np.float64) * max(0.01, 1 + std_drift * steps)).tolist()
+        for class_name, values in std_values_dict.items()
+    }
+    return means, stds
+
+
+def stream_batches(features, classes, mean_values_dict, std_values_dict, batch_size=500, seed=0, n_batches=None,
+                   mean_drift=0.0, std_drift=0.0, drift_start=0, correlation_dict=None, distribution_dict=None):
+    """
+    Yields (batch index, X, y) batches; runs forever when n_batches is None.
+
+    Batches are generated lazily, one at a time, with generation.generate.
+    """
+    batch_index = 0
+    while n_batches is None or batch_index < n_batches:
+        means, stds = drifted_params(
+            mean_values_dict, std_values_dict, batch_index, mean_drift, std_drift, drift_start
+        )
+        X, y = generation.generate(
+            features, classes, batch_size, means, stds, seed=[seed, batch_index], n_workers=1,
+            correlation_dict=correlation_dict, distribution_dict=distribution_dict
+        )
+        yield batch_index, X, y
+        batch_index += 1
+
+
+def make_online_models(random_state=None):
+    """Returns the incremental candidates, keyed by display name."""
+    return {
+        "Gaussian Naive Bayes": GaussianNB(),
+        "SGD Classifier": SGDClassifier(loss="log_loss", random_state=random_state),
+        "Multi-layer Perceptron": MLPClassifier(hidden_layer_sizes=(50,), random_state=random_state),
+    }
+
+
+def prequential(batches, models, classes):
+    """
+    Test-then-train evaluation over a stream of batches.
+
+    Args:
+        batches: Iterable of (batch index, X, y), e.g. stream_batches().
+        models: {model name: estimator with partial_fit}; fitted in place.
+        classes: Every class label the stream can produce.
+
+    Yields one dict per batch: batch index, and per model the batch accuracy
+    and the cumulative accuracy so far. Scores are None for the first batch,
+    which the models have not seen anything before.
+    """
+    classes = np.asarray(classes, dtype=object)
+    scaler = StandardScaler()
+    correct = {model_name: 0 for model_name in models}
+    scored_rows = 0
+    trained = False
+    for batch_index, X, y in batches:
+        record = {"batch": batch_index}
+        if trained:
+            scaled = scaler.transform(X)
+            scored_rows += len(y)
+            for model_name, model in models.items():
+                inputs = scaled if model_name in SCALE_SENSITIVE_ONLINE_MODELS else X
+                hits = int((model.predict(inputs) == y).sum())
+                correct[model_name] += hits
+                record[model_name] = hits / len(y)
+                record[f"{model_name} (cumulative)"] = correct[model_name] / scored_rows
+        else:
+            for model_name in models:
+                record[model_name] = None
+                record[f"{model_name} (cumulative)"] = None
+
+        # Train on the batch only after every model has been scored on it
+        scaler.partial_fit(X)
+        scaled = scaler.transform(X)
+        for model_name, model in models.items():
+            inputs = scaled if model_name in SCALE_SENSITIVE_ONLINE_MODELS else X
+            model.partial_fit(inputs, y, classes=classes)
+            # MLPClassifier appends to loss_curve_ on every call; keep it bounded on endless streams
+            if len(getattr(model, "loss_curve_", ())) > STREAM_HISTORY_POINTS:
+                del model.loss_curve_[:-STREAM_HISTORY_POINTS]
+        trained = True
+        yield record
+
+
+class PrequentialHistory:
+    """Keeps the most recent prequential records for charting, in constant memory."""
+
+    def __init__(self, max_points=STREAM_HISTORY_POINTS):
+        self.records = deque(maxlen=max_points)
+        self.batches = 0
+
+    def append(self, record):
+        self.records.append(record)
+        self.batches += 1
+
+    def frame(self, columns=None):
+        """Returns the retained records as a DataFrame indexed by batch."""
+        frame = pd.DataFrame(list(self.records)).set_index("batch")
+        return frame[columns] if columns is not None else frame
+